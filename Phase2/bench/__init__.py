@@ -0,0 +1 @@
+# Snake Game - Throughput benchmarks
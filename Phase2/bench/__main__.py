@@ -0,0 +1,194 @@
+"""
+Run the benchmark suite and print the results as JSON.
+
+    python -m bench                              # env, agent, replay, training
+    python -m bench --quick -o bench/HEAD.json
+    python -m bench --only env replay_fill
+    python -m bench --all                        # plus every other bench module
+    python -m bench --compare bench/base.json bench/HEAD.json
+
+--compare lines up two result files and prints every rate (*_per_sec,
+higher is better) and latency (*_us, lower is better) that changed by more
+than --threshold.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# name → fn(quick) → JSON-able results; modules are imported only when run
+def _env(quick):
+    from bench import env
+    return env.run(steps=5_000 if quick else 20_000)
+
+
+def _agent(quick):
+    from bench import agent
+    return agent.run(seconds=0.5 if quick else 2.0, calls=1000 if quick else 5000)
+
+
+def _replay(quick):
+    from bench import replay
+    return replay.run(capacities=(100_000,) if quick else (100_000, 1_000_000),
+                      seconds=0.3 if quick else 1.0)
+
+
+def _replay_fill(quick):
+    from bench import replay
+    return replay.by_fill(capacity=100_000 if quick else 1_000_000, seconds=0.3 if quick else 1.0)
+
+
+def _training(quick):
+    from bench import training
+    return training.run(episodes=20 if quick else 100)
+
+
+def _env_pool(quick):
+    from bench import env_pool
+    return env_pool.run(steps=100 if quick else 500)
+
+
+def _staging(quick):
+    from bench import staging
+    return staging.run(steps=50 if quick else 200)
+
+
+def _prefetch(quick):
+    from bench import prefetch
+    return prefetch.run(seconds=1.0 if quick else 3.0)
+
+
+def _inference(quick):
+    from bench import inference
+    return inference.run(calls=50 if quick else 200)
+
+
+def _accel(quick):
+    from bench import accel
+    return accel.run(seconds=1.0 if quick else 3.0)
+
+
+def _apex(quick):
+    from bench import apex
+    return apex.run(seconds=3.0 if quick else 10.0)
+
+
+def _tabular(quick):
+    from bench import tabular
+    return tabular.run(max_seconds=60.0 if quick else 600.0)
+
+
+def _startup(quick):
+    from bench import startup
+    return startup.run(repeats=1 if quick else 3)
+
+
+CORE = {"env": _env, "agent": _agent, "replay": _replay, "replay_fill": _replay_fill,
+        "training": _training}
+EXTRA = {"env_pool": _env_pool, "staging": _staging, "prefetch": _prefetch, "inference": _inference,
+         "accel": _accel, "apex": _apex, "tabular": _tabular, "startup": _startup}
+BENCHES = {**CORE, **EXTRA}
+
+
+def environment():
+    """Where the numbers came from: commit, versions, cores."""
+    import numpy as np
+    import torch
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {"commit": commit, "dirty": dirty,
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "numpy": np.__version__, "torch": torch.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count(), "torch_threads": torch.get_num_threads()}
+
+
+def run(names=tuple(CORE), quick=False, log=sys.stderr):
+    results = {"environment": environment(), "quick": quick, "results": {}}
+    # run from Phase2/ so relative model paths resolve as they do for train.py
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        for name in names:
+            print(f"  running {name}...", file=log, flush=True)
+            results["results"][name] = BENCHES[name](quick)
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+def metrics(results, prefix=""):
+    """Flatten nested results → {path: value} for the rates and latencies in them."""
+    out = {}
+    items = results.items() if isinstance(results, dict) else enumerate(results)
+    for key, value in items:
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, (dict, list)):
+            out.update(metrics(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if str(key).endswith("_per_sec") or str(key).endswith("_us"):
+                out[path] = value
+    return out
+
+
+def compare(base, new, threshold=0.05):
+    """Changed metrics → list of (path, base, new, speedup), speedup > 1 meaning faster."""
+    old, cur = metrics(base["results"]), metrics(new["results"])
+    changes = []
+    for path in sorted(old.keys() & cur.keys()):
+        a, b = old[path], cur[path]
+        if not a or not b:
+            continue
+        speedup = b / a if path.endswith("_per_sec") else a / b
+        if abs(speedup - 1) > threshold:
+            changes.append((path, a, b, speedup))
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Run the SnakeRL benchmark suite")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHES), default=None,
+                        help="Benchmarks to run (default: the core set)")
+    parser.add_argument("--all", action="store_true", help="Run every benchmark")
+    parser.add_argument("--quick", action="store_true", help="Shorter runs, noisier numbers")
+    parser.add_argument("-o", "--out", default=None, help="Write the JSON here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), default=None,
+                        help="Diff two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="Smallest relative change --compare reports")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        print(f"  {base['environment']['commit']} -> {new['environment']['commit']}")
+        print("-" * 60)
+        for path, a, b, speedup in compare(base, new, args.threshold):
+            print(f"  {path:<48s} {a:>12,.1f} -> {b:>12,.1f}  x{speedup:.2f}"
+                  f"  {'faster' if speedup > 1 else 'slower'}")
+        sys.exit()
+
+    names = list(BENCHES) if args.all else args.only or list(CORE)
+    results = run(names, args.quick)
+    text = json.dumps(results, indent=1)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        print(f"  -> {args.out}", file=sys.stderr)
+    else:
+        print(text)
@@ -0,0 +1,73 @@
+"""Learner updates/sec across torch.compile, bf16 autocast and thread counts.
+
+Every combination runs in a fresh interpreter: inter-op threads can only
+be set once per process, and compiled graphs should not leak between cases.
+
+    python -m bench.accel --threads 1 2 4 --batch-size 256 --seconds 5
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def measure(compile_model, bf16, threads, interop_threads, batch_size, seconds, capacity=100_000):
+    """One case, in this process → result dict."""
+    from train import set_threads
+    set_threads(threads, interop_threads)
+
+    from rl.agent import DQNAgent
+    from bench.replay import fill
+
+    agent = DQNAgent(memory_size=capacity, compile_model=compile_model, bf16=bf16)
+    fill(agent.memory)
+    start = time.perf_counter()
+    agent.train_long_memory(batch_size)   # compiles on the first call
+    warmup = time.perf_counter() - start
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        agent.train_long_memory(batch_size)
+        count += 1
+    return {"compile": compile_model, "bf16": bf16, "threads": threads,
+            "interop_threads": interop_threads, "batch_size": batch_size,
+            "warmup_s": warmup, "updates_per_sec": count / (time.perf_counter() - start)}
+
+
+def run(threads=(1,), interop_threads=1, batch_size=256, seconds=3.0,
+        compile_options=(False, True), bf16_options=(False, True)):
+    results = []
+    for compile_model, bf16, n in itertools.product(compile_options, bf16_options, threads):
+        case = json.dumps([compile_model, bf16, n, interop_threads, batch_size, seconds])
+        out = subprocess.run([sys.executable, "-m", "bench.accel", "--case", case],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark compile / bf16 / thread settings")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="Intra-op thread counts to try")
+    parser.add_argument("--interop-threads", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Time spent per case")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(measure(*json.loads(args.case))))
+        sys.exit()
+
+    print("-" * 60)
+    for r in run(sorted(set(args.threads)), args.interop_threads, args.batch_size, args.seconds):
+        flags = "+".join(f for f, on in (("compile", r["compile"]), ("bf16", r["bf16"])) if on) or "eager"
+        print(f"  {flags:<13s}  |  {r['threads']:>2d} threads  |  {r['updates_per_sec']:>6,.0f} updates/s"
+              f"  |  warm-up {r['warmup_s']:.1f} s")
@@ -0,0 +1,82 @@
+"""DQNAgent.get_action latency and _train_step updates/sec by batch size.
+
+_train_step is timed on tensors already on the device, so the numbers are
+the gradient step alone, without replay sampling or staging.
+
+    python -m bench.agent --batch-sizes 1 64 256 1024
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.settings import RL_ACTION_SIZE
+from game.state_bits import STATE_TABLE, REACHABLE
+from rl.agent import DQNAgent
+
+
+def action_latency(agent, calls=5000, seed=0):
+    """Greedy get_action on reachable states → mean, p50 and p99 microseconds."""
+    agent.epsilon = 0.0   # every call goes through the model
+    rng = np.random.default_rng(seed)
+    states = STATE_TABLE[rng.choice(np.flatnonzero(REACHABLE), calls)]
+    agent.get_action(states[0])   # warm up
+    times = np.empty(calls)
+    for i, state in enumerate(states):
+        start = time.perf_counter()
+        agent.get_action(state)
+        times[i] = time.perf_counter() - start
+    times *= 1e6
+    return {"mean_us": float(times.mean()), "p50_us": float(np.percentile(times, 50)),
+            "p99_us": float(np.percentile(times, 99))}
+
+
+def updates_per_sec(agent, batch_size, seconds=2.0, seed=0):
+    rng = np.random.default_rng(seed)
+    dev = agent.device
+    batch = (
+        torch.from_numpy(STATE_TABLE[rng.integers(0, len(STATE_TABLE), batch_size)]).to(dev),
+        torch.from_numpy(rng.integers(0, RL_ACTION_SIZE, batch_size)).to(dev),
+        torch.from_numpy(rng.standard_normal(batch_size).astype(np.float32)).to(dev),
+        torch.from_numpy(STATE_TABLE[rng.integers(0, len(STATE_TABLE), batch_size)]).to(dev),
+        torch.from_numpy(rng.random(batch_size) < 0.01).to(dev),
+    )
+    agent._train_step(*batch)   # warm up
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        agent._train_step(*batch)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def run(batch_sizes=(1, 64, 256, 1024), seconds=2.0, calls=5000):
+    agent = DQNAgent(memory_size=1)
+    results = {"device": str(agent.device), "get_action": action_latency(agent, calls), "train_step": []}
+    for batch_size in batch_sizes:
+        rate = updates_per_sec(agent, batch_size, seconds)
+        results["train_step"].append({"batch_size": batch_size, "updates_per_sec": rate,
+                                      "samples_per_sec": rate * batch_size})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DQNAgent inference and updates")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 256, 1024])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time spent per batch size")
+    parser.add_argument("--calls", type=int, default=5000, help="Timed get_action calls")
+    args = parser.parse_args()
+
+    results = run(args.batch_sizes, args.seconds, args.calls)
+    a = results["get_action"]
+    print(f"  Device: {results['device']}")
+    print("-" * 60)
+    print(f"  get_action  |  mean {a['mean_us']:.1f} us  p50 {a['p50_us']:.1f} us  p99 {a['p99_us']:.1f} us")
+    for r in results["train_step"]:
+        print(f"  batch {r['batch_size']:>5d}  |  {r['updates_per_sec']:>8,.0f} updates/s"
+              f"  |  {r['samples_per_sec']:>11,.0f} samples/s")
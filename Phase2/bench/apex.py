@@ -0,0 +1,65 @@
+"""Actor-learner throughput: env steps/sec and learner updates/sec by actor count.
+
+    python -m bench.apex --max-actors 8 --seconds 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.settings import RL_BATCH_SIZE, RL_APEX_SYNC_EVERY
+from rl.agent import DQNAgent
+from rl.apex import ActorPool
+
+
+def measure(num_actors, envs_per_actor=8, seconds=10.0, batch_size=RL_BATCH_SIZE,
+            sync_every=RL_APEX_SYNC_EVERY):
+    """Run the learner loop of train_apex for `seconds` → (steps/s, updates/s)."""
+    agent = DQNAgent(packed_memory=True)
+    updates = 0
+    with ActorPool(agent.model, num_actors, envs_per_actor, seed=0) as pool:
+        # timing starts once the replay holds a first batch
+        while len(agent.memory) < batch_size:
+            for batch, _ in pool.poll(timeout=1.0):
+                agent.remember_batch(batch["states"], batch["actions"], batch["rewards"],
+                                     batch["next_states"], batch["dones"])
+        steps0 = pool.env_steps
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for batch, _ in pool.poll():
+                agent.remember_batch(batch["states"], batch["actions"], batch["rewards"],
+                                     batch["next_states"], batch["dones"])
+            agent.train_long_memory(batch_size)
+            updates += 1
+            if updates % sync_every == 0:
+                pool.publish(agent.model)
+        elapsed = time.perf_counter() - start
+        return (pool.env_steps - steps0) / elapsed, updates / elapsed
+
+
+def run(max_actors=None, envs_per_actor=8, seconds=10.0):
+    max_actors = max_actors or max(1, (os.cpu_count() or 2) - 1)
+    counts = sorted({2 ** k for k in range(max_actors.bit_length()) if 2 ** k <= max_actors} | {max_actors})
+    results = []
+    for actors in counts:
+        steps, updates = measure(actors, envs_per_actor, seconds)
+        results.append({"actors": actors, "envs_per_actor": envs_per_actor,
+                        "steps_per_sec": steps, "updates_per_sec": updates})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark actor-learner training")
+    parser.add_argument("--max-actors", type=int, default=None, help="Largest pool (default: cores - 1)")
+    parser.add_argument("--envs", type=int, default=8, help="Boards per actor")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Time spent per actor count")
+    args = parser.parse_args()
+
+    print(f"  {args.envs} boards per actor, {os.cpu_count()} cores")
+    print("-" * 50)
+    for r in run(args.max_actors, args.envs, args.seconds):
+        print(f"  {r['actors']:>3d} actor(s)  |  {r['steps_per_sec']:>9,.0f} steps/s"
+              f"  |  {r['updates_per_sec']:>6,.0f} updates/s")
@@ -0,0 +1,100 @@
+"""SnakeEnv.step and _get_state calls/sec by snake length and obstacle count.
+
+    python -m bench.env --lengths 3 100 400 --obstacles 0 15
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.settings import COLS, ROWS, CLOCKWISE, MAX_OBSTACLES, CELL_BODY
+from game.snake_env import SnakeEnv
+
+
+def stage(env, length, obstacles):
+    """Put env in a mid-game position: a `length` cell snake laid in rows, plus obstacles."""
+    env.reset()
+    # boustrophedon path from the top-left corner; the head is its last cell
+    path = []
+    for y in range(ROWS):
+        xs = range(COLS) if y % 2 == 0 else range(COLS - 1, -1, -1)
+        path.extend((x, y) for x in xs)
+    body = path[:length]
+    for column in env.grid:
+        column[:] = bytes(ROWS)
+    env.free.reset()
+    env.snake.clear()
+    for cell in reversed(body):
+        env.snake.append(cell)
+        env.grid[cell[0]][cell[1]] = CELL_BODY
+        env.free.occupy(cell)
+    (hx, hy), (nx, ny) = body[-1], body[-2]
+    env.dir_idx = CLOCKWISE.index((hx - nx, hy - ny))
+    env.obstacles = []
+    env._place_food()
+    while len(env.obstacles) < obstacles and env._place_obstacle():
+        pass
+
+
+def step_rate(length, obstacles, steps=20_000, restage_every=200, seed=0):
+    """
+    Timed env.step calls/sec, steering away from danger so games run long.
+
+    Only step() itself is timed; the board is re-staged after a death and
+    every `restage_every` steps so the snake stays near `length`.
+    """
+    env = SnakeEnv()
+    rng = random.Random(seed)
+    stage(env, length, obstacles)
+    state = env._get_state()
+    elapsed = 0.0
+    since = 0
+    for _ in range(steps):
+        safe = [a for a in range(3) if not state[a]]
+        action = rng.choice(safe) if safe else 0
+        start = time.perf_counter()
+        state, _, done, _ = env.step(action)
+        elapsed += time.perf_counter() - start
+        since += 1
+        if done or since == restage_every:
+            stage(env, length, obstacles)
+            state = env._get_state()
+            since = 0
+    return steps / elapsed
+
+
+def state_rate(length, obstacles, calls=20_000):
+    env = SnakeEnv()
+    stage(env, length, obstacles)
+    get_state = env._get_state
+    start = time.perf_counter()
+    for _ in range(calls):
+        get_state()
+    return calls / (time.perf_counter() - start)
+
+
+def run(lengths=(3, 100, 400), obstacles=(0, MAX_OBSTACLES), steps=20_000):
+    results = []
+    for length in lengths:
+        for count in obstacles:
+            results.append({"length": length, "obstacles": count,
+                            "steps_per_sec": step_rate(length, count, steps),
+                            "get_state_per_sec": state_rate(length, count, steps)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SnakeEnv")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[3, 100, 400])
+    parser.add_argument("--obstacles", type=int, nargs="+", default=[0, MAX_OBSTACLES])
+    parser.add_argument("--steps", type=int, default=20_000, help="Timed calls per case")
+    args = parser.parse_args()
+
+    print("-" * 60)
+    for r in run(args.lengths, args.obstacles, args.steps):
+        print(f"  length {r['length']:>4d}  obstacles {r['obstacles']:>2d}  |  "
+              f"step {r['steps_per_sec']:>9,.0f}/s  |  _get_state {r['get_state_per_sec']:>9,.0f}/s")
@@ -0,0 +1,52 @@
+"""Env steps/sec of SubprocSnakeEnv from 1 to N workers.
+
+    python -m bench.env_pool --envs 1024 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.vec_env import VecSnakeEnv
+from game.subproc_env import SubprocSnakeEnv
+
+
+def steps_per_sec(env, num_envs, steps):
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 3, (steps, num_envs))
+    env.reset()
+    env.step(actions[0])   # warm up
+    start = time.perf_counter()
+    for a in actions:
+        env.step(a)
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+def run(num_envs=1024, steps=500, max_workers=None):
+    max_workers = max_workers or os.cpu_count() or 1
+    results = {"in_process": steps_per_sec(VecSnakeEnv(num_envs, seed=0), num_envs, steps)}
+    counts = sorted({2 ** k for k in range(max_workers.bit_length()) if 2 ** k <= max_workers} | {max_workers})
+    for workers in counts:
+        with SubprocSnakeEnv(num_envs, workers, seed=0) as env:
+            results[workers] = steps_per_sec(env, num_envs, steps)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the multiprocess env pool")
+    parser.add_argument("--envs", type=int, default=1024, help="Boards across all workers")
+    parser.add_argument("--steps", type=int, default=500, help="Batched steps to time")
+    parser.add_argument("--max-workers", type=int, default=None, help="Largest pool (default: all cores)")
+    args = parser.parse_args()
+
+    results = run(args.envs, args.steps, args.max_workers)
+    base = results["in_process"]
+    print(f"  {args.envs} boards, {args.steps} steps, {os.cpu_count()} cores")
+    print("-" * 50)
+    for workers, rate in results.items():
+        label = "VecSnakeEnv" if workers == "in_process" else f"{workers} worker(s)"
+        print(f"  {label:<14}  {rate:>12,.0f} steps/s  x{rate / base:.2f}")
@@ -0,0 +1,64 @@
+"""Greedy DQN forward latency by backend and batch size, with action agreement.
+
+Agreement is measured against the float model on all 2048 possible states.
+
+    python -m bench.inference --model models/snake_dqn.pth --compile
+"""
+
+import argparse
+import os
+import sys
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.state_bits import STATE_TABLE
+from rl.model import DQN
+from rl.export import AUTO_BACKENDS, build, latency
+
+
+def run(model_path=None, batch_sizes=(1, 64, 1024), backends=AUTO_BACKENDS, calls=200, threads=1):
+    torch.set_num_threads(threads)
+    model = DQN()
+    if model_path:
+        model.load_state_dict(torch.load(model_path, map_location="cpu", weights_only=True))
+    model.eval()
+    states = torch.from_numpy(STATE_TABLE)
+    with torch.inference_mode():
+        reference = model(states).argmax(dim=1)
+
+    results = []
+    for name in backends:
+        try:
+            module = build(model, name)
+        except RuntimeError as e:
+            results.append({"backend": name, "error": str(e)})
+            continue
+        with torch.inference_mode():
+            agreement = (module(states).argmax(dim=1) == reference).float().mean().item()
+        row = {"backend": name, "agreement": agreement}
+        for b in batch_sizes:
+            row[f"us_batch_{b}"] = latency(module, b, calls) * 1e6
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DQN inference backends")
+    parser.add_argument("--model", default=None, help="Checkpoint (default: untrained weights)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--calls", type=int, default=200, help="Timed calls per case")
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    parser.add_argument("--compile", action="store_true", help="Include torch.compile (slow warm-up)")
+    args = parser.parse_args()
+
+    backends = AUTO_BACKENDS + (("compile",) if args.compile else ())
+    results = run(args.model, args.batch_sizes, backends, args.calls, args.threads)
+    print(f"  {'backend':<8} " + "".join(f"| {f'batch {b}':>12} " for b in args.batch_sizes) + "| agreement")
+    print("-" * 60)
+    for r in results:
+        if "error" in r:
+            print(f"  {r['backend']:<8} | {r['error']}")
+            continue
+        print(f"  {r['backend']:<8} " + "".join(f"| {r[f'us_batch_{b}']:>9.1f} us " for b in args.batch_sizes)
+              + f"| {r['agreement'] * 100:>7.2f}%")
@@ -0,0 +1,55 @@
+"""Learner updates/sec with replay sampled inline vs by the background prefetcher.
+
+    python -m bench.prefetch --batch-sizes 64 256 1024 --seconds 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rl.agent import DQNAgent
+from bench.replay import fill
+
+
+def updates_per_sec(agent, batch_size, seconds):
+    agent.train_long_memory(batch_size)   # warm up
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        agent.train_long_memory(batch_size)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def run(batch_sizes=(64, 256, 1024), capacity=100_000, seconds=3.0, prioritized=False):
+    results = []
+    for batch_size in batch_sizes:
+        agent = DQNAgent(memory_size=capacity, prioritized=prioritized)
+        fill(agent.memory)
+        inline = updates_per_sec(agent, batch_size, seconds)
+        agent.start_prefetch(batch_size)
+        ahead = updates_per_sec(agent, batch_size, seconds)
+        stats = agent.stop_prefetch()
+        n = max(1, stats["batches"])
+        results.append({"batch_size": batch_size, "prioritized": prioritized,
+                        "inline_updates_per_sec": inline, "prefetch_updates_per_sec": ahead,
+                        "wait_us": stats["wait_s"] * 1e6 / n, "compute_us": stats["compute_s"] * 1e6 / n,
+                        "sample_us": stats["sample_s"] * 1e6 / n})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the replay prefetcher")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Time spent per case")
+    parser.add_argument("--prioritized", action="store_true")
+    args = parser.parse_args()
+
+    print("-" * 60)
+    for r in run(args.batch_sizes, seconds=args.seconds, prioritized=args.prioritized):
+        print(f"  batch {r['batch_size']:>5d}  |  inline {r['inline_updates_per_sec']:>6,.0f}/s"
+              f"  |  prefetch {r['prefetch_updates_per_sec']:>6,.0f}/s  |  waits {r['wait_us']:>6.0f} us"
+              f"  compute {r['compute_us']:>6.0f} us  (sampling {r['sample_us']:.0f} us off-thread)")
@@ -0,0 +1,89 @@
+"""Replay sampling throughput, uniform vs prioritized (sum-tree), by capacity and fill.
+
+    python -m bench.replay --capacities 100000 1000000
+    python -m bench.replay --capacities 1000000 --fills 0.01 0.1 0.5 1
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.settings import RL_BATCH_SIZE, RL_STATE_SIZE
+from rl.replay import ReplayBuffer, PrioritizedReplayBuffer
+
+
+def fill(buffer, chunk=100_000, size=None):
+    """Push `size` random transitions (default: up to capacity)."""
+    size = buffer.capacity if size is None else size
+    rng = np.random.default_rng(0)
+    for start in range(0, size, chunk):
+        n = min(chunk, size - start)
+        states = (rng.random((n, RL_STATE_SIZE)) < 0.5).astype(np.float32)
+        buffer.push_batch(states, rng.integers(0, 3, n), rng.standard_normal(n),
+                          states, rng.random(n) < 0.01)
+
+
+def batches_per_sec(buffer, batch_size, seconds=1.0):
+    """Sample (and, for PER, write back new priorities) for about `seconds`."""
+    rng = np.random.default_rng(1)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if isinstance(buffer, PrioritizedReplayBuffer):
+            _, idx, _ = buffer.sample(batch_size)
+            buffer.update_priorities(idx, rng.standard_normal(len(idx)))
+        else:
+            buffer.sample(batch_size)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def run(capacities=(100_000, 1_000_000), batch_size=RL_BATCH_SIZE, seconds=1.0):
+    results = []
+    for capacity in capacities:
+        for name, cls in (("uniform", ReplayBuffer), ("prioritized", PrioritizedReplayBuffer)):
+            buffer = cls(capacity, seed=0)
+            fill(buffer)
+            rate = batches_per_sec(buffer, batch_size, seconds)
+            results.append({"buffer": name, "capacity": capacity, "batch_size": batch_size,
+                            "batches_per_sec": rate, "transitions_per_sec": rate * batch_size})
+    return results
+
+
+def by_fill(capacity=1_000_000, fills=(0.01, 0.1, 0.5, 1.0), batch_size=RL_BATCH_SIZE, seconds=1.0):
+    """Microseconds per sampled batch as the buffer fills up."""
+    results = []
+    for name, cls in (("uniform", ReplayBuffer), ("prioritized", PrioritizedReplayBuffer)):
+        buffer = cls(capacity, seed=0)
+        for frac in sorted(fills):
+            # top up to the next level instead of refilling from scratch
+            fill(buffer, size=max(batch_size, int(capacity * frac)) - len(buffer))
+            rate = batches_per_sec(buffer, batch_size, seconds)
+            results.append({"buffer": name, "capacity": capacity, "fill": frac, "size": len(buffer),
+                            "batch_size": batch_size, "us_per_batch": 1e6 / rate})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark replay sampling")
+    parser.add_argument("--capacities", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=RL_BATCH_SIZE)
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time spent per case")
+    parser.add_argument("--fills", type=float, nargs="+", default=None,
+                        help="Time sampling at these fractions of each capacity instead")
+    args = parser.parse_args()
+
+    print("-" * 60)
+    if args.fills:
+        for capacity in args.capacities:
+            for r in by_fill(capacity, args.fills, args.batch_size, args.seconds):
+                print(f"  {r['buffer']:<12} {r['size']:>10,d} / {r['capacity']:,d}  |  "
+                      f"{r['us_per_batch']:>8.1f} us/batch")
+        sys.exit()
+    for r in run(args.capacities, args.batch_size, args.seconds):
+        print(f"  {r['buffer']:<12} {r['capacity']:>10,d}  |  {r['batches_per_sec']:>9,.0f} batches/s"
+              f"  |  {r['transitions_per_sec']:>11,.0f} samples/s")
@@ -0,0 +1,101 @@
+"""Allocations per training step: per-call batch tensors vs a reused BatchStaging.
+
+Torch allocations are counted from the profiler's memory events; NumPy
+arrays show up in the peak heap growth traced by tracemalloc during a call.
+
+    python -m bench.staging --steps 200
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import torch
+from torch.profiler import profile, ProfilerActivity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.settings import RL_BATCH_SIZE
+from rl.agent import DQNAgent
+from rl.replay import ReplayBuffer, BatchStaging
+from bench.replay import fill
+
+
+def torch_allocs(fn, steps):
+    """Mean (ops that allocated, bytes allocated) per call, from the torch profiler."""
+    fn()   # warm-up outside the profiler
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        for _ in range(steps):
+            fn()
+    # each op's self usage is what it allocated itself; "[memory]" events are
+    # allocations made outside any op
+    sizes = [e.self_cpu_memory_usage for e in prof.events() if e.self_cpu_memory_usage > 0]
+    return len(sizes) / steps, sum(sizes) / steps
+
+
+def heap_bytes(fn, steps):
+    """Largest transient heap growth during any call (NumPy arrays included)."""
+    fn()
+    tracemalloc.start()
+    worst = 0
+    try:
+        for _ in range(steps):
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn()
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return worst
+
+
+def per_call_us(fn, steps):
+    fn()
+    start = time.perf_counter()
+    for _ in range(steps):
+        fn()
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def run(steps=200, batch_size=RL_BATCH_SIZE, capacity=100_000, packed=False):
+    torch.set_num_threads(1)
+    memory = ReplayBuffer(capacity, seed=0, packed=packed)
+    fill(memory)
+    staging = BatchStaging(batch_size)
+
+    agent = DQNAgent(packed_memory=packed, memory_size=capacity)
+    agent.memory = memory
+    state = np.zeros(11, dtype=np.float32)
+    agent.epsilon = 0.0
+
+    cases = {
+        "sample":       lambda: memory.sample(batch_size),
+        "sample_into":  lambda: memory.sample_into(staging),
+        "train_step":   lambda: agent._train_step(*memory.sample(batch_size)),
+        "train_staged": lambda: agent.train_long_memory(batch_size),
+        "get_action":   lambda: agent.get_action(state),
+    }
+    results = []
+    for name, fn in cases.items():
+        allocs, nbytes = torch_allocs(fn, steps)
+        results.append({"case": name, "batch_size": batch_size, "packed": packed,
+                        "torch_allocs": allocs, "torch_bytes": nbytes,
+                        "heap_bytes": heap_bytes(fn, steps),
+                        "us_per_call": per_call_us(fn, steps)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-step allocations")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=RL_BATCH_SIZE)
+    parser.add_argument("--packed", action="store_true")
+    args = parser.parse_args()
+
+    print("-" * 60)
+    for r in run(args.steps, args.batch_size, packed=args.packed):
+        print(f"  {r['case']:<13} |  {r['torch_allocs']:>5.1f} torch allocs"
+              f" ({r['torch_bytes'] / 1024:>6.1f} KB)"
+              f"  |  {r['heap_bytes']:>9,d} heap bytes  |  {r['us_per_call']:>8.1f} us")
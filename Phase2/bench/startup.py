@@ -0,0 +1,72 @@
+"""Startup cost of AI Watch's model loading: torch DQNAgent vs the NumPy engines.
+
+Each case runs in a fresh interpreter, from launch to its first action.
+
+    python -m bench.startup --model models/snake_dqn.pth
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRELUDE = "import sys, resource; sys.path.insert(0, {root!r}); state = [0.0] * 11\n"
+EPILOGUE = "\nprint(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+CASES = {
+    "torch DQNAgent": ("from rl.agent import DQNAgent\n"
+                       "agent = DQNAgent(); agent.load({pth!r}); agent.epsilon = 0\n"
+                       "agent.get_action(state)"),
+    "numpy mlp .pth": ("from rl.numpy_dqn import NumpyDQN\n"
+                       "NumpyDQN.load({pth!r}).get_action(state)"),
+    "numpy mlp .npz": ("from rl.numpy_dqn import NumpyDQN\n"
+                       "NumpyDQN.load({npz!r}).get_action(state)"),
+    "table .npz":     ("from rl.table_policy import TablePolicy\n"
+                       "TablePolicy.load({table!r}).get_action(state)"),
+}
+
+
+def measure(code, repeats=3):
+    """Best wall-clock seconds and peak RSS (MB) of running code in a new python."""
+    best, rss = float("inf"), 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        best = min(best, time.perf_counter() - start)
+        rss = int(out.stdout.split()[-1]) / 1024   # ru_maxrss is in KB on Linux
+    return best, rss
+
+
+def run(model_path="models/snake_dqn.pth", repeats=3):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"pth": os.path.abspath(model_path),
+                 "npz": os.path.join(tmp, "snake_dqn.npz"),
+                 "table": os.path.join(tmp, "snake_table.npz")}
+        prep = (PRELUDE.format(root=ROOT) +
+                "from rl.numpy_dqn import NumpyDQN\nfrom rl.table_policy import export\n"
+                f"NumpyDQN.load({paths['pth']!r}).save({paths['npz']!r})\n"
+                f"export({paths['pth']!r}).save({paths['table']!r})" + EPILOGUE)
+        subprocess.run([sys.executable, "-c", prep], check=True, capture_output=True)
+
+        baseline = measure(PRELUDE.format(root=ROOT) + "import numpy" + EPILOGUE, repeats)
+        results = [{"case": "python + numpy", "seconds": baseline[0], "rss_mb": baseline[1]}]
+        for name, body in CASES.items():
+            code = PRELUDE.format(root=ROOT) + body.format(**paths) + EPILOGUE
+            seconds, rss = measure(code, repeats)
+            results.append({"case": name, "seconds": seconds, "rss_mb": rss})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark model-loading startup time and memory")
+    parser.add_argument("--model", default="models/snake_dqn.pth", help="DQN checkpoint to load")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per case (best time is kept)")
+    args = parser.parse_args()
+
+    print("-" * 50)
+    for r in run(args.model, args.repeats):
+        print(f"  {r['case']:<16} |  {r['seconds'] * 1000:>7.0f} ms  |  {r['rss_mb']:>6.1f} MB RSS")
@@ -0,0 +1,76 @@
+"""Wall-clock to a target mean score: tabular Q-learning vs DQN, same boards and recipe.
+
+    python -m bench.tabular --target 10 --envs 32 --max-seconds 600
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.vec_env import VecSnakeEnv
+from rl.agent import DQNAgent
+from rl.tabular import TabularAgent
+from rl.schedule import TrainSchedule
+
+
+def time_to_score(agent, num_envs=32, target=10.0, window=100, max_seconds=600.0, seed=0):
+    """
+    Run train.py's vec recipe until the mean of the last `window` scores
+    reaches `target` → dict of seconds, episodes, env steps and that mean.
+    """
+    env = VecSnakeEnv(num_envs, seed=seed)
+    schedule = TrainSchedule()
+    recent = deque(maxlen=window)
+    episodes = steps = 0
+    states = env.reset()
+    start = time.perf_counter()
+    reached = False
+    while not reached and time.perf_counter() - start < max_seconds:
+        actions = agent.get_actions(states)
+        next_states, rewards, dones, info = env.step(actions)
+        agent.train_batch(states, actions, rewards, info["final_state"], dones)
+        agent.remember_batch(states, actions, rewards, info["final_state"], dones)
+        schedule.after_step(agent, num_envs)
+        states = next_states
+        steps += num_envs
+        for i in np.flatnonzero(dones):
+            episodes += 1
+            schedule.after_episode(agent)
+            agent.decay_epsilon()
+            agent.n_games += 1
+            recent.append(int(info["score"][i]))
+            if len(recent) == window and np.mean(recent) >= target:
+                reached = True
+                break
+    return {"seconds": time.perf_counter() - start, "reached": reached, "episodes": episodes,
+            "env_steps": steps, "mean_score": float(np.mean(recent)) if recent else 0.0}
+
+
+def run(target=10.0, num_envs=32, window=100, max_seconds=600.0, seed=0):
+    results = []
+    for name, agent in (("tabular", TabularAgent()), ("dqn", DQNAgent())):
+        agent.rng = np.random.default_rng(seed)
+        r = time_to_score(agent, num_envs, target, window, max_seconds, seed)
+        results.append({"algo": name, "target": target, "num_envs": num_envs, **r})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tabular Q-learning against DQN")
+    parser.add_argument("--target", type=float, default=10.0, help="Mean score to reach")
+    parser.add_argument("--window", type=int, default=100, help="Episodes in the rolling mean")
+    parser.add_argument("--envs", type=int, default=32, help="Boards stepped together")
+    parser.add_argument("--max-seconds", type=float, default=600.0, help="Give up after this long")
+    args = parser.parse_args()
+
+    print(f"  target mean {args.target} over {args.window} episodes, {args.envs} boards")
+    print("-" * 60)
+    for r in run(args.target, args.envs, args.window, args.max_seconds):
+        status = "" if r["reached"] else "  (not reached)"
+        print(f"  {r['algo']:<8} |  {r['seconds']:>7.1f} s  |  {r['episodes']:>6,d} episodes"
+              f"  |  {r['env_steps']:>10,d} steps  |  mean {r['mean_score']:>5.1f}{status}")
@@ -0,0 +1,55 @@
+"""End-to-end headless training speed: episodes/sec of train() and train_vec().
+
+Runs start from scratch in a scratch directory, so models and checkpoints
+under ./models are neither resumed from nor overwritten.
+
+    python -m bench.training --episodes 200 --envs 64
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import train as trainer
+
+
+def episodes_per_sec(fn, episodes, **kwargs):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                fn(episodes=episodes, plot=False, **kwargs)
+                elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+    return episodes / elapsed
+
+
+def run(episodes=100, num_envs=64):
+    results = [{"loop": "train", "episodes": episodes,
+                "episodes_per_sec": episodes_per_sec(trainer.train, episodes)}]
+    if num_envs:
+        results.append({"loop": "train_vec", "envs": num_envs, "episodes": episodes,
+                        "episodes_per_sec": episodes_per_sec(trainer.train_vec, episodes,
+                                                             num_envs=num_envs)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark headless training loops")
+    parser.add_argument("--episodes", type=int, default=100, help="Episodes per loop")
+    parser.add_argument("--envs", type=int, default=64, help="Boards for train_vec (0 to skip)")
+    args = parser.parse_args()
+
+    print("-" * 60)
+    for r in run(args.episodes, args.envs):
+        label = r["loop"] + (f" ({r['envs']} boards)" if "envs" in r else "")
+        print(f"  {label:<24s}  |  {r['episodes_per_sec']:>8,.1f} episodes/s")
@@ -0,0 +1,216 @@
+"""
+Evaluate trained models with greedy play (ε = 0) across fixed seeds.
+
+A greedy agent's action depends only on the 11-bit state, so every model
+is first turned into its 2048-state Q table. Episodes then run on
+VecSnakeEnv boards in worker processes, in chunks with fixed seeds, so
+every model faces the same starting boards and results do not depend on
+the number of workers.
+
+    python evaluate.py                                          # models/snake_dqn.pth
+    python evaluate.py models/checkpoints models/snake_table.npz --episodes 5000
+    python evaluate.py a.pth b.pth --json eval.json
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import pickle
+import sys
+import time
+import zipfile
+import numpy as np
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game.settings import DEATH_CAUSES
+from game.state_bits import STATE_TABLE
+from game.vec_env import VecSnakeEnv
+
+MODEL_EXTS = (".pth", ".pt", ".npz")
+
+
+@functools.lru_cache(maxsize=None)
+def q_table(path):
+    """
+    (2048, 3) Q table of any saved model: a DQN .pth, an .npz from
+    rl.numpy_dqn or rl.table_policy, a full training checkpoint or an
+    int8/TorchScript file from rl.export.
+    """
+    from rl.numpy_dqn import NumpyDQN
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            if "q" in data:
+                return data["q"]
+            return NumpyDQN(dict(data)).q_table()
+    if path.endswith(".pth"):
+        return NumpyDQN.load(path).q_table()
+    # a full checkpoint holds optimizer and replay state too; only torch reads those
+    import torch
+    from rl.export import is_exported, load_exported
+    if is_exported(path):
+        with torch.inference_mode():
+            return load_exported(path)(torch.from_numpy(STATE_TABLE)).numpy()
+    state = torch.load(path, map_location="cpu", weights_only=True)
+    if "q" in state:
+        return state["q"].numpy()
+    return NumpyDQN({k: v.numpy() for k, v in state["model"].items()}).q_table()
+
+
+def play(q, quotas, seed, wall_kill=True):
+    """
+    Greedy episodes on len(quotas) boards, quotas[i] of them on board i
+    → (scores, lengths, cause indices into DEATH_CAUSES), board by board.
+
+    Each board plays its first quotas[i] games back to back, so no board
+    favours short episodes and few boards sit idle waiting for the longest.
+    """
+    quotas = np.asarray(quotas, dtype=np.int64)
+    greedy = np.asarray(q).argmax(axis=1)
+    env = VecSnakeEnv(len(quotas), wall_kill=wall_kill, seed=seed, packed=True)
+    states = env.reset()
+    total = int(quotas.sum())
+    first = np.cumsum(quotas) - quotas   # each board's first result slot
+    played = np.zeros(len(quotas), dtype=np.int64)
+    scores = np.zeros(total, dtype=np.int64)
+    lengths = np.zeros(total, dtype=np.int64)
+    causes = np.zeros(total, dtype=np.int8)
+    while (played < quotas).any():
+        # boards past their quota keep stepping; their games are ignored
+        states, _, dones, info = env.step(greedy[states])
+        ended = np.flatnonzero(dones & (played < quotas))
+        if ended.size:
+            slot = first[ended] + played[ended]
+            scores[slot] = info["score"][ended]
+            lengths[slot] = info["steps"][ended]
+            causes[slot] = info["cause"][ended]
+            played[ended] += 1
+    return scores, lengths, causes
+
+
+def _play_chunk(job):
+    model, chunk, q, quotas, seed, wall_kill = job
+    return model, chunk, play(q, quotas, np.random.SeedSequence([seed, chunk]), wall_kill)
+
+
+def summarize(scores, lengths, causes):
+    n = len(scores)
+    counts = np.bincount(causes, minlength=len(DEATH_CAUSES))
+    return {
+        "episodes": n,
+        "mean": float(scores.mean()),
+        "ci95": float(1.96 * scores.std(ddof=1) / np.sqrt(n)) if n > 1 else 0.0,
+        "median": float(np.median(scores)),
+        "p95": float(np.percentile(scores, 95)),
+        "max": int(scores.max()),
+        "mean_length": float(lengths.mean()),
+        "p95_length": float(np.percentile(lengths, 95)),
+        "causes": {name: int(counts[i]) / n for i, name in enumerate(DEATH_CAUSES) if i},
+    }
+
+
+def evaluate(paths, episodes=1000, seed=0, workers=None, chunk=1024, boards=256, wall_kill=True):
+    """
+    Greedy-evaluate every model → {path: summary}, ranked best mean score
+    first. Episodes are split into jobs of `chunk`, each spread over `boards`.
+    """
+    workers = workers or os.cpu_count() or 1
+    tables = {path: q_table(path) for path in paths}
+    sizes = [min(chunk, episodes - start) for start in range(0, episodes, chunk)]
+    quotas = [np.bincount(np.arange(size) % min(boards, size)) for size in sizes]
+    jobs = [(path, c, tables[path], quotas[c], seed, wall_kill)
+            for path in paths for c in range(len(sizes))]
+
+    parts = {path: [None] * len(sizes) for path in paths}
+    if workers == 1:
+        done = map(_play_chunk, jobs)
+    else:
+        pool = mp.get_context("spawn").Pool(workers)
+        done = pool.imap_unordered(_play_chunk, jobs)
+    try:
+        for path, c, result in done:
+            parts[path][c] = result
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+
+    results = {}
+    for path in paths:
+        scores, lengths, causes = (np.concatenate(a) for a in zip(*parts[path]))
+        results[path] = summarize(scores, lengths, causes)
+    ranked = sorted(paths, key=lambda p: results[p]["mean"], reverse=True)
+    best = results[ranked[0]]
+    for rank, path in enumerate(ranked, 1):
+        r = results[path]
+        r["rank"] = rank
+        # the gap to the best model is within noise when its 95% intervals overlap
+        r["tied_with_best"] = bool(best["mean"] - r["mean"] <= best["ci95"] + r["ci95"])
+    return {path: results[path] for path in ranked}
+
+
+def _expand(paths):
+    """Directories → the models inside them, oldest name first, skipping files that are not models."""
+    out = []
+    for path in paths:
+        if not os.path.isdir(path):
+            out.append(path)
+            continue
+        for p in sorted(glob.glob(os.path.join(path, "*"))):
+            if not p.endswith(MODEL_EXTS) or ".tmp" in p:
+                continue
+            try:
+                q_table(p)   # cached, so evaluate() does not read it again
+            except (OSError, EOFError, KeyError, ValueError, RuntimeError,
+                    pickle.UnpicklingError, zipfile.BadZipFile) as e:
+                print(f"  Skipping {p}: not a readable model ({type(e).__name__}: {e})", file=sys.stderr)
+                continue
+            out.append(p)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Greedy evaluation of trained Snake models")
+    parser.add_argument("models", nargs="*", default=["models/snake_dqn.pth"],
+                        help="Model files or directories of them (.pth, .pt checkpoints or exports, .npz)")
+    parser.add_argument("--episodes", type=int, default=1000, help="Greedy episodes per model")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the board sequence")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=1024, help="Episodes per job")
+    parser.add_argument("--boards", type=int, default=256, help="Boards stepped together in a job")
+    parser.add_argument("--no-wall-kill", action="store_true", help="Wrap around edges instead of dying")
+    parser.add_argument("--json", default=None, help="Also write the results here")
+    args = parser.parse_args()
+
+    if min(args.episodes, args.chunk, args.boards) < 1:
+        parser.error("--episodes, --chunk and --boards must be at least 1")
+    start = time.perf_counter()
+    paths = _expand(args.models)
+    if not paths:
+        parser.error("no model files found")
+
+    results = evaluate(paths, args.episodes, args.seed, args.workers, args.chunk, args.boards,
+                       not args.no_wall_kill)
+    elapsed = time.perf_counter() - start
+
+    print(f"  {len(paths)} model(s) x {args.episodes:,d} greedy episodes, seed {args.seed}, "
+          f"{elapsed:.1f}s")
+    print("-" * 100)
+    print(f"  {'#':>2s}  {'model':<36s} {'mean':>12s} {'median':>7s} {'p95':>5s} {'max':>4s} "
+          f"{'length':>7s}  ends (wall/self/obstacle/starvation/full)")
+    for path, r in results.items():
+        c = r["causes"]
+        mark = "=" if r["tied_with_best"] and r["rank"] > 1 else " "
+        print(f"  {r['rank']:>2d}{mark} {os.path.relpath(path):<36.36s} {r['mean']:>6.2f} ±{r['ci95']:<5.2f}"
+              f"{r['median']:>7.1f} {r['p95']:>5.0f} {r['max']:>4d} {r['mean_length']:>7.0f}  "
+              f"{c['wall']:.0%} / {c['self']:.0%} / {c['obstacle']:.0%} / {c['starvation']:.0%} / "
+              f"{c['full']:.0%}")
+    if len(results) > 1:
+        print("  = within the 95% interval of the best model")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"episodes": args.episodes, "seed": args.seed, "results": results}, f, indent=1)
+        print(f"  -> {args.json}")
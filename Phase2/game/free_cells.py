@@ -0,0 +1,70 @@
+"""Index of empty board cells with O(1) update and random sampling."""
+
+import random
+from game.settings import COLS, ROWS
+
+
+class FreeCells:
+    """
+    Set of unoccupied (x, y) cells.
+
+    Free cells are packed at the front of `cells`, and `pos` maps a cell to
+    its slot there, so occupying one swaps the last free cell into its slot.
+    Occupancy is reference counted: a cell covered twice (a snake growing in
+    place, a shielded pass through its own body) only frees up when both
+    occupants have left.
+    """
+
+    def __init__(self, cols=COLS, rows=ROWS):
+        self.cols = cols
+        self.rows = rows
+        self.reset()
+
+    def reset(self):
+        n = self.cols * self.rows
+        self.cells = list(range(n))
+        self.pos = list(range(n))
+        self.refs = [0] * n
+        self.size = n
+
+    def __len__(self):
+        return self.size
+
+    def is_free(self, point):
+        return self.refs[point[0] * self.rows + point[1]] == 0
+
+    def occupy(self, point):
+        i = point[0] * self.rows + point[1]
+        self.refs[i] += 1
+        if self.refs[i] == 1:
+            # swap i with the last free cell, then shrink the free region
+            last_slot = self.size - 1
+            slot = self.pos[i]
+            last = self.cells[last_slot]
+            self.cells[slot], self.pos[last] = last, slot
+            self.cells[last_slot], self.pos[i] = i, last_slot
+            self.size -= 1
+
+    def release(self, point):
+        i = point[0] * self.rows + point[1]
+        self.refs[i] -= 1
+        if self.refs[i] == 0:
+            # swap i with the first occupied cell, then grow the free region
+            end_slot = self.size
+            slot = self.pos[i]
+            first = self.cells[end_slot]
+            self.cells[slot], self.pos[first] = first, slot
+            self.cells[end_slot], self.pos[i] = i, end_slot
+            self.size += 1
+
+    def sample(self, exclude=()):
+        """Random free cell not in exclude, or None if there is none."""
+        if self.size <= len(exclude):
+            # so few cells left that rejection could spin; pick from what is left
+            left = [divmod(c, self.rows) for c in self.cells[:self.size]]
+            left = [p for p in left if p not in exclude]
+            return random.choice(left) if left else None
+        while True:
+            point = divmod(self.cells[random.randrange(self.size)], self.rows)
+            if point not in exclude:
+                return point
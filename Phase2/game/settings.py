@@ -64,10 +64,41 @@ RL_EPSILON_MIN = 0.01
 RL_EPSILON_DECAY = 0.995
 RL_BATCH_SIZE = 64
 RL_MEMORY_SIZE = 100_000
+RL_PACKED_MEMORY = False    # store replay states as 11-bit uint16 codes
+RL_PRIORITIZED = False      # prioritized experience replay
+RL_PER_ALPHA = 0.6          # how strongly priorities skew sampling
+RL_PER_BETA_START = 0.4     # importance-sampling correction, annealed to 1
+RL_PER_BETA_GAMES = 1000    # games over which beta reaches 1
+RL_APEX_EPS_BASE = 0.4      # actor-learner mode: per-board epsilon base^(1 + alpha*i/(N-1))
+RL_APEX_EPS_ALPHA = 7.0
+RL_APEX_SYNC_EVERY = 50     # learner updates between weight broadcasts to actors
+RL_TABULAR_LR = 0.1         # step size of the tabular Q-learning backend
+RL_COMPILE = False          # torch.compile the model used by training updates
+RL_BF16 = False             # bf16 autocast for the training forward passes
+RL_THREADS = 0              # torch intra-op threads per process (0 = torch default)
+RL_INTEROP_THREADS = 0      # torch inter-op threads per process (0 = torch default)
+RL_CHECKPOINT_DIR = "models/checkpoints"
+RL_CHECKPOINT_EVERY = 100   # episodes between full training-state checkpoints
+RL_CHECKPOINT_KEEP = 3      # newest checkpoints kept on disk
+RL_METRICS_PATH = "models/metrics.jsonl"   # per-episode training log
+RL_METRICS_WINDOW = 100     # episodes in the rolling stats
+RL_SWEEP_CHECK_EVERY = 50   # sweep: episodes between early-stopping checks
+RL_SWEEP_GRACE = 100        # sweep: episodes every trial plays before it can be stopped
+RL_SWEEP_QUANTILE = 0.5     # sweep: stop a trial whose rolling mean is below this quantile of its peers'
+RL_SWEEP_MIN_PEERS = 3      # sweep: peers needed at a check before anything is stopped
 RL_HIDDEN_1 = 256
 RL_HIDDEN_2 = 128
 RL_MAX_STEPS = 200          
 
+# occupancy grid cell kinds
+CELL_EMPTY = 0
+CELL_BODY = 1
+CELL_OBSTACLE = 2
+CELL_WALL = 3
+
+# how an episode ended; VecSnakeEnv reports indices into this in infos["cause"]
+DEATH_CAUSES = ("none", "wall", "self", "obstacle", "starvation", "full")
+
 DIR_RIGHT = (1, 0)
 DIR_LEFT  = (-1, 0)
 DIR_UP    = (0, -1)
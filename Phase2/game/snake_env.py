@@ -1,32 +1,55 @@
 """Gym-style Snake environment for RL training."""
 
 import numpy as np
-import random
+from collections import deque
 from game.settings import (
     WIDTH, HEIGHT, BLOCK, COLS, ROWS,
     DIR_RIGHT, DIR_LEFT, DIR_UP, DIR_DOWN, CLOCKWISE,
     RL_STATE_SIZE, RL_MAX_STEPS,
     WALL_KILL, OBSTACLE_START_LEVEL, MAX_OBSTACLES, LEVEL_UP_SCORE,
+    CELL_EMPTY, CELL_BODY, CELL_OBSTACLE,
 )
+from game.free_cells import FreeCells
+
+# what running into each kind of cell is recorded as in info["cause"]
+_CRASH_CAUSES = {CELL_BODY: "self", CELL_OBSTACLE: "obstacle"}
 
 
 class SnakeEnv:
     """RL-compatible Snake environment."""
 
-    def __init__(self, render_mode=False, wall_kill=True):
+    def __init__(self, render_mode=False, wall_kill=True, max_steps=RL_MAX_STEPS):
         self.render_mode = render_mode
         self.wall_kill = wall_kill   # RL training uses walls for cleaner learning
+        self.max_steps = max_steps   # steps without food allowed per body segment
+        # grid[x][y] holds a CELL_* kind so collision checks are one lookup
+        self.grid = [bytearray(ROWS) for _ in range(COLS)]
+        self.free = FreeCells()
         self.reset()
 
+    @property
+    def direction(self):
+        return CLOCKWISE[self.dir_idx]
+
+    @direction.setter
+    def direction(self, value):
+        self.dir_idx = CLOCKWISE.index(value)
+
     def reset(self):
         """Reset and return initial state."""
         cx, cy = COLS // 2, ROWS // 2
-        self.direction = DIR_RIGHT
-        self.snake = [
+        self.dir_idx = 0   # index into CLOCKWISE, starts facing right
+        self.snake = deque([
             (cx, cy),
             (cx - 1, cy),
             (cx - 2, cy),
-        ]
+        ])
+        for column in self.grid:
+            column[:] = bytes(ROWS)
+        self.free.reset()
+        for x, y in self.snake:
+            self.grid[x][y] = CELL_BODY
+            self.free.occupy((x, y))
         self.score = 0
         self.level = 1
         self.steps_since_food = 0
@@ -44,7 +67,7 @@ class SnakeEnv:
         self._update_direction(action)
 
         head_x, head_y = self.snake[0]
-        dx, dy = self.direction
+        dx, dy = CLOCKWISE[self.dir_idx]
         new_head = (head_x + dx, head_y + dy)
 
         if not self.wall_kill:
@@ -56,14 +79,16 @@ class SnakeEnv:
         if self._is_collision(new_head):
             done = True
             reward = -10
-            return self._get_state(), reward, done, {"score": self.score}
+            return self._get_state(), reward, done, {"score": self.score, "cause": self._crash_cause(new_head)}
 
-        if self.steps_since_food > RL_MAX_STEPS * len(self.snake):
+        if self.steps_since_food > self.max_steps * len(self.snake):
             done = True
             reward = -10
-            return self._get_state(), reward, done, {"score": self.score}
+            return self._get_state(), reward, done, {"score": self.score, "cause": "starvation"}
 
-        self.snake.insert(0, new_head)
+        self.snake.appendleft(new_head)
+        self.grid[new_head[0]][new_head[1]] = CELL_BODY
+        self.free.occupy(new_head)
 
         if new_head == self.food:
             self.score += 1
@@ -71,8 +96,13 @@ class SnakeEnv:
             reward = 10
             self._update_level()
             self._place_food()
+            if self.food is None:
+                # the snake fills the board: nothing is left to eat, so the game is won
+                return self._get_state(), reward, True, {"score": self.score, "cause": "full"}
         else:
-            self.snake.pop()
+            tail = self.snake.pop()
+            self.grid[tail[0]][tail[1]] = CELL_EMPTY
+            self.free.release(tail)
             old_dist = abs(head_x - self.food[0]) + abs(head_y - self.food[1])
             new_dist = abs(new_head[0] - self.food[0]) + abs(new_head[1] - self.food[1])
             if new_dist < old_dist:
@@ -81,7 +111,7 @@ class SnakeEnv:
                 reward = -1
 
         state = self._get_state()
-        return state, reward, done, {"score": self.score}
+        return state, reward, done, {"score": self.score, "cause": None}
 
 
     def _get_state(self):
@@ -92,8 +122,10 @@ class SnakeEnv:
            food_left, food_right, food_up, food_down]
         """
         head = self.snake[0]
-        d = self.direction
-        idx = CLOCKWISE.index(d)
+        # with no food on a full board every food feature is off
+        food = self.food if self.food is not None else head
+        idx = self.dir_idx
+        d = CLOCKWISE[idx]
         d_right = CLOCKWISE[(idx + 1) % 4]
         d_left = CLOCKWISE[(idx - 1) % 4]
 
@@ -109,10 +141,10 @@ class SnakeEnv:
             d == DIR_DOWN,
 
             # position of food 
-            self.food[0] < head[0],   
-            self.food[0] > head[0], 
-            self.food[1] < head[1],
-            self.food[1] > head[1], 
+            food[0] < head[0],
+            food[0] > head[0],
+            food[1] < head[1],
+            food[1] > head[1],
         ]
         return np.array(state, dtype=np.float32)
 
@@ -120,53 +152,52 @@ class SnakeEnv:
 
     def _update_direction(self, action):
         """action: 0=straight, 1=right turn, 2=left turn"""
-        idx = CLOCKWISE.index(self.direction)
         if action == 1:
-            self.direction = CLOCKWISE[(idx + 1) % 4]
+            self.dir_idx = (self.dir_idx + 1) % 4
         elif action == 2:
-            self.direction = CLOCKWISE[(idx - 1) % 4]
+            self.dir_idx = (self.dir_idx - 1) % 4
 
     def _is_collision(self, point):
         x, y = point
-        if self.wall_kill:
-            if x < 0 or x >= COLS or y < 0 or y >= ROWS:
-                return True
-        if point in self.snake[1:]:
-            return True
-        if point in self.obstacles:
-            return True
-        return False
+        if x < 0 or x >= COLS or y < 0 or y >= ROWS:
+            # off-board points only exist with walls on; wrapped moves never probe them
+            return self.wall_kill
+        # the head itself does not count, matching the old snake[1:] check
+        return self.grid[x][y] != CELL_EMPTY and point != self.snake[0]
+
+    def _crash_cause(self, point):
+        x, y = point
+        if x < 0 or x >= COLS or y < 0 or y >= ROWS:
+            return "wall"
+        return _CRASH_CAUSES[self.grid[x][y]]
 
     def _place_food(self):
-        occupied = set(self.snake) | set(self.obstacles)
-        while True:
-            pos = (random.randint(0, COLS - 1), random.randint(0, ROWS - 1))
-            if pos not in occupied:
-                self.food = pos
-                break
+        """Food on a random free cell; None once the snake covers the board."""
+        self.food = self.free.sample()
 
     def _update_level(self):
         self.level = self.score // LEVEL_UP_SCORE + 1
         if self.level >= OBSTACLE_START_LEVEL:
             target = min((self.level - OBSTACLE_START_LEVEL + 1) * 2, MAX_OBSTACLES)
             while len(self.obstacles) < target:
-                self._place_obstacle()
+                if not self._place_obstacle():
+                    break
 
     def _place_obstacle(self):
-        occupied = set(self.snake) | set(self.obstacles) | {self.food}
         head = self.snake[0]
-        safe_zone = set()
-        for dx in range(-3, 4):
-            for dy in range(-3, 4):
-                safe_zone.add((head[0] + dx, head[1] + dy))
-
         attempts = 0
         while attempts < 100:
-            pos = (random.randint(0, COLS - 1), random.randint(0, ROWS - 1))
-            if pos not in occupied and pos not in safe_zone:
+            pos = self.free.sample(exclude=(self.food,))
+            if pos is None:
+                return False
+            x, y = pos
+            if abs(x - head[0]) > 3 or abs(y - head[1]) > 3:
                 self.obstacles.append(pos)
-                return
+                self.grid[x][y] = CELL_OBSTACLE
+                self.free.occupy(pos)
+                return True
             attempts += 1
+        return False
 
     #Pixel coordinates for rendering
 
@@ -174,6 +205,8 @@ class SnakeEnv:
         return [(x * BLOCK, y * BLOCK) for x, y in self.snake]
 
     def get_food_pixel(self):
+        if self.food is None:
+            return None
         return (self.food[0] * BLOCK, self.food[1] * BLOCK)
 
     def get_obstacle_pixels(self):
@@ -1,10 +1,13 @@
 import pygame
 import random
 import os
+import pickle
 import sys
+import zipfile
 
 from game.settings import *
 from game.renderer import Renderer
+from game.free_cells import FreeCells
 
 
 class PowerUp:
@@ -86,7 +89,12 @@ class SnakeGame:
         level = 1
         speed = GAME_SPEED
 
-        food = self._random_empty(snake, [])
+        # cells not covered by snake or obstacles, kept in sync on every move
+        free = FreeCells()
+        for seg in snake:
+            free.occupy(seg)
+
+        food = self._random_empty(free)
         obstacles = []
         powerup = None
 
@@ -131,7 +139,8 @@ class SnakeGame:
                             return          
                         continue
                     if event.key == pygame.K_w:
-                        if level >= MAGNET_UNLOCK_LEVEL and magnet_active == 0 and magnet_cooldown == 0:
+                        if (level >= MAGNET_UNLOCK_LEVEL and magnet_active == 0 and magnet_cooldown == 0
+                                and food is not None):
                             magnet_active = MAGNET_DURATION
                             food_float = (float(food[0]), float(food[1]))
                             if "magnet" not in active_effects:
@@ -191,15 +200,21 @@ class SnakeGame:
                         score += pts
                         self.renderer.show_score_popup(f"+{pts}", food_px[0], food_px[1] - 10)
                         snake.insert(0, snake[0])  
+                        free.occupy(snake[0])
                         new_level = score // LEVEL_UP_SCORE + 1
                         if new_level > level:
                             level = new_level
                             speed = GAME_SPEED + level
-                        food = self._random_empty(snake, obstacles)
+                        food = self._random_empty(free)
+                        if food is None:
+                            # the snake fills the board: nothing left to eat
+                            game_over = True
+                            self._on_death(snake, score)
+                            continue
                         food_float = (float(food[0]), float(food[1]))
                     else:
                         new_food = (round(food_float[0]) % COLS, round(food_float[1]) % ROWS)
-                        if new_food not in snake and new_food not in obstacles:
+                        if free.is_free(new_food):
                             food = new_food
                     if magnet_active == 0:
                         magnet_cooldown = MAGNET_COOLDOWN
@@ -243,6 +258,7 @@ class SnakeGame:
                 if shield_count > 0:
                     shield_count -= 1
                     obstacles.remove(new_head)
+                    free.release(new_head)
                     if "shield" in active_effects and shield_count == 0:
                         active_effects.remove("shield")
                 else:
@@ -251,6 +267,7 @@ class SnakeGame:
                     continue
 
             snake.insert(0, new_head)
+            free.occupy(new_head)
 
             ate_food = new_head == food
             if ate_food:
@@ -276,14 +293,20 @@ class SnakeGame:
                 if level >= OBSTACLE_START_LEVEL:
                     target = min((level - OBSTACLE_START_LEVEL + 1) * 2, MAX_OBSTACLES)
                     while len(obstacles) < target:
-                        obs = self._random_empty(snake, obstacles + [food])
-                        if obs:
-                            obstacles.append(obs)
-
-                food = self._random_empty(snake, obstacles)
-                food_float = None  
+                        obs = self._random_empty(free, [food])
+                        if obs is None:
+                            break
+                        obstacles.append(obs)
+                        free.occupy(obs)
+
+                food = self._random_empty(free)
+                food_float = None
+                if food is None:
+                    game_over = True
+                    self._on_death(snake, score)
+                    continue
             else:
-                snake.pop()
+                free.release(snake.pop())
 
             if magnet_active > 0:
                 magnet_active -= 1
@@ -304,15 +327,20 @@ class SnakeGame:
                     score += pts
                     self.renderer.show_score_popup(f"+{pts}", food_px[0], food_px[1] - 10)
                     snake.insert(0, snake[0])
+                    free.occupy(snake[0])
                     new_level = score // LEVEL_UP_SCORE + 1
                     if new_level > level:
                         level = new_level
                         speed = GAME_SPEED + level
-                    food = self._random_empty(snake, obstacles)
+                    food = self._random_empty(free)
+                    if food is None:
+                        game_over = True
+                        self._on_death(snake, score)
+                        continue
                     food_float = (float(food[0]), float(food[1]))
                 else:
                     new_food = (round(food_float[0]) % COLS, round(food_float[1]) % ROWS)
-                    if new_food not in snake and new_food not in obstacles:
+                    if free.is_free(new_food):
                         food = new_food
                 if magnet_active == 0:
                     magnet_cooldown = MAGNET_COOLDOWN
@@ -329,7 +357,7 @@ class SnakeGame:
 
             if powerup is None and random.random() < POWERUP_SPAWN_CHANCE:
                 kind = random.choice(["speed", "shield", "double"])
-                pos = self._random_empty(snake, obstacles + [food])
+                pos = self._random_empty(free, [food])
                 if pos:
                     powerup = PowerUp(pos, kind)
 
@@ -372,21 +400,30 @@ class SnakeGame:
         """Load trained model and let it play."""
         from game.snake_env import SnakeEnv
 
+        from rl.table_policy import TablePolicy
+        from rl.numpy_dqn import NumpyDQN
+
+        # play the newest saved model; none of these loaders import torch
+        # (a lookup table wins a tie, it is O(1) per step)
+        loaders = [
+            (os.path.join("models", "snake_table.npz"), TablePolicy.load),
+            (os.path.join("models", "snake_qtable.npz"), TablePolicy.load),
+            (os.path.join("models", "snake_dqn.npz"), NumpyDQN.load),
+            (os.path.join("models", "snake_dqn.pth"), NumpyDQN.load),
+        ]
+        found = [(os.path.getmtime(path), -i, path, load)
+                 for i, (path, load) in enumerate(loaders) if os.path.exists(path)]
         agent = None
-        has_model = False
-        try:
-            import torch
-            from rl.agent import DQNAgent
-            agent = DQNAgent()
-            model_path = os.path.join("models", "snake_dqn.pth")
-            if os.path.exists(model_path):
-                agent.load(model_path)
-                agent.epsilon = 0  
-                has_model = True
-            else:
-                agent = None
-        except ImportError:
-            pass
+        skipped = ""
+        for _, _, path, load in sorted(found, reverse=True):
+            try:
+                agent = load(path)
+                break
+            except (OSError, EOFError, KeyError, ValueError, pickle.UnpicklingError, zipfile.BadZipFile) as e:
+                # corrupt or half-written: fall back to the next-newest model, or random play
+                print(f"  Could not load {path}: {e}")
+                skipped = f"  |  {os.path.basename(path)} unreadable ({type(e).__name__})"
+        has_model = agent is not None
 
         env = SnakeEnv(wall_kill=True)
         state = env.reset()
@@ -417,6 +454,7 @@ class SnakeGame:
                 info_str = f"Game #{games_played}  |  Speed: {speed}"
                 if not has_model:
                     info_str += "  |  NO MODEL (random)"
+                info_str += skipped
                 self.renderer.draw_ai_label(info_str)
                 self.renderer.draw_scanlines()
                 self.renderer.update()
@@ -468,6 +506,7 @@ class SnakeGame:
             info_str = f"Game #{games_played + 1}  |  Speed: {speed}  |  +/- to change"
             if not has_model:
                 info_str = f"NO TRAINED MODEL (random)  |  Run: python train.py"
+            info_str += skipped
             self.renderer.draw_ai_label(info_str)
             self.renderer.draw_scanlines()
             self.renderer.update()
@@ -479,22 +518,17 @@ class SnakeGame:
                          score, level, combo, active_effects):
         obs_pixels = [(o[0] * BLOCK, o[1] * BLOCK) for o in obstacles]
         self.renderer.draw_obstacles(obs_pixels)
-        self.renderer.draw_food((food[0] * BLOCK, food[1] * BLOCK))
+        if food is not None:
+            self.renderer.draw_food((food[0] * BLOCK, food[1] * BLOCK))
         if powerup:
             px, py = powerup.pixel_pos
             self.renderer.draw_powerup(px, py, powerup.kind)
         snake_pixels = [(s[0] * BLOCK, s[1] * BLOCK) for s in snake]
         self.renderer.draw_snake(snake_pixels, direction)
 
-    def _random_empty(self, snake, extra_occupied):
-        occupied = set(snake) | set(extra_occupied)
-        attempts = 0
-        while attempts < 500:
-            pos = (random.randint(0, COLS - 1), random.randint(0, ROWS - 1))
-            if pos not in occupied:
-                return pos
-            attempts += 1
-        return (0, 0)
+    def _random_empty(self, free, extra_occupied=()):
+        """Random cell off the snake and obstacles, or None when the board is full."""
+        return free.sample(exclude=extra_occupied)
 
     def _on_death(self, snake, score):
         snake_pixels = [(s[0] * BLOCK, s[1] * BLOCK) for s in snake]
@@ -0,0 +1,44 @@
+"""Pack the 11 binary state features into one uint16 and back."""
+
+import numpy as np
+from game.settings import RL_STATE_SIZE
+
+NUM_STATES = 1 << RL_STATE_SIZE   # 2048 possible observations
+
+# name of each bit, in SnakeEnv._get_state order
+FEATURES = (
+    "danger_straight", "danger_right", "danger_left",
+    "dir_left", "dir_right", "dir_up", "dir_down",
+    "food_left", "food_right", "food_up", "food_down",
+)
+
+# bit i of a code is feature i of the state vector
+BIT_WEIGHTS = (1 << np.arange(RL_STATE_SIZE)).astype(np.uint16)
+
+# every possible state vector, indexed by its code
+STATE_TABLE = ((np.arange(NUM_STATES)[:, None] >> np.arange(RL_STATE_SIZE)) & 1).astype(np.float32)
+
+
+def pack_states(states):
+    """(..., 11) float/bool states → (...) uint16 codes; codes pass through."""
+    states = np.asarray(states)
+    if states.dtype == np.uint16:
+        return states
+    return ((states > 0.5) @ BIT_WEIGHTS).astype(np.uint16)
+
+
+def unpack_states(codes):
+    """(...) codes → (..., 11) float32 states in one table lookup."""
+    return STATE_TABLE[codes]
+
+
+def describe(code):
+    """Names of the features set in a code, e.g. 'dir_up food_left'."""
+    return " ".join(name for i, name in enumerate(FEATURES) if code >> i & 1)
+
+
+# codes consistent with a real board: exactly one direction bit, and food never
+# on both sides of the head along one axis
+_dirs = (STATE_TABLE[:, 3:7].sum(axis=1) == 1)
+_food = (STATE_TABLE[:, 7] + STATE_TABLE[:, 8] < 2) & (STATE_TABLE[:, 9] + STATE_TABLE[:, 10] < 2)
+REACHABLE = _dirs & _food
@@ -0,0 +1,270 @@
+"""Vectorized Snake environment: N boards stepped in lockstep with NumPy."""
+
+import numpy as np
+from game.settings import (
+    COLS, ROWS, CLOCKWISE,
+    RL_MAX_STEPS,
+    OBSTACLE_START_LEVEL, MAX_OBSTACLES, LEVEL_UP_SCORE,
+    CELL_EMPTY as EMPTY, CELL_BODY as BODY, CELL_OBSTACLE as OBSTACLE, CELL_WALL as WALL,
+    DEATH_CAUSES,
+)
+from game.state_bits import STATE_TABLE
+
+# boards are padded by one WALL cell on every side and addressed by a flat
+# cell index, so a neighbour lookup never needs a bounds check
+STRIDE = ROWS + 2
+CELLS = (COLS + 2) * STRIDE
+
+# CLOCKWISE as flat-index offsets, so a direction is just an index 0..3
+DIR_OFFSETS = np.array([dx * STRIDE + dy for dx, dy in CLOCKWISE], dtype=np.int64)
+# action 0=straight, 1=right, 2=left as a step around CLOCKWISE
+ACTION_TURNS = np.array([0, 1, 3], dtype=np.int64)
+# cells probed for danger straight, right and left of each direction
+PROBE_OFFSETS = DIR_OFFSETS[(np.arange(4)[:, None] + np.array([0, 1, 3])) % 4]
+
+# the state is built as its 11-bit code (see game.state_bits), one term per
+# feature group, and expanded to floats with a single STATE_TABLE lookup
+
+# dir_left, dir_right, dir_up, dir_down bits (features 3..6) per CLOCKWISE index
+DIR_CODES = np.array([1 << 4, 1 << 6, 1 << 3, 1 << 5], dtype=np.int64)
+
+# food_left/right/up/down bits (features 7..10) per (sign(fx - hx) + 1, sign(fy - hy) + 1)
+FOOD_CODES = np.array([[(sx < 0) << 7 | (sx > 0) << 8 | (sy < 0) << 9 | (sy > 0) << 10
+                        for sy in (-1, 0, 1)] for sx in (-1, 0, 1)], dtype=np.int64)
+
+# DEATH_CAUSES index for running into each cell kind; starvation and a full board are set apart
+KIND_CAUSES = np.zeros(4, dtype=np.int8)
+KIND_CAUSES[[BODY, OBSTACLE, WALL]] = [DEATH_CAUSES.index(c) for c in ("self", "obstacle", "wall")]
+STARVED = DEATH_CAUSES.index("starvation")
+FULL = DEATH_CAUSES.index("full")
+
+# the three probed cell values packed base-4 (cell kinds are 0..3)
+PROBE_WEIGHTS = np.array([1, 4, 16], dtype=np.int64)
+
+
+# board coordinates of every flat cell, so converting back is one lookup
+CELL_X, CELL_Y = np.divmod(np.arange(CELLS, dtype=np.int64), STRIDE)
+CELL_X -= 1
+CELL_Y -= 1
+
+
+def to_cell(x, y):
+    return (x + 1) * STRIDE + (y + 1)
+
+
+def to_xy(cell):
+    return CELL_X[cell], CELL_Y[cell]
+
+
+class VecSnakeEnv:
+    """
+    Batch of independent SnakeEnv boards held in arrays.
+
+    step(actions) reproduces SnakeEnv.step for every board at once and
+    returns stacked (states, rewards, dones, infos). Finished boards are
+    reset automatically; the state they died in is kept in
+    infos["final_state"], their final score in infos["score"], their
+    episode length in infos["steps"] and how they died in infos["cause"]
+    (an index into DEATH_CAUSES, 0 for boards still playing).
+
+    With packed=True states come back as (N,) uint16 codes instead of
+    (N, 11) floats.
+    """
+
+    def __init__(self, num_envs, wall_kill=True, seed=None, packed=False, max_steps=RL_MAX_STEPS):
+        self.num_envs = num_envs
+        self.wall_kill = wall_kill
+        self.max_steps = max_steps
+        self.packed = packed
+        self.rng = np.random.default_rng(seed)
+        self.capacity = COLS * ROWS
+
+        # danger bits 0..2 for every combination of probed cell kinds: outside
+        # the board is only deadly with walls on (SnakeEnv never wraps the probe)
+        danger = np.array([False, True, True, wall_kill])
+        kinds = (np.arange(64)[:, None] // PROBE_WEIGHTS) % 4
+        self._danger_codes = (danger[kinds] << np.arange(3)).sum(axis=1)
+
+        cx, cy = COLS // 2, ROWS // 2
+        self._start = np.array([to_cell(cx - 2, cy), to_cell(cx - 1, cy), to_cell(cx, cy)])
+        self._blank = np.full((COLS + 2, ROWS + 2), WALL, dtype=np.int8)
+        self._blank[1:-1, 1:-1] = EMPTY
+        self._blank.reshape(-1)[self._start] = BODY
+
+        n = num_envs
+        self.grid = np.empty((n, COLS + 2, ROWS + 2), dtype=np.int8)
+        self._cells = self.grid.reshape(-1)
+        self._base = np.arange(n, dtype=np.int64) * CELLS
+        # body is a ring buffer per board, head at head_ptr, tail length-1 behind
+        self.body = np.zeros((n, self.capacity), dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.dir_idx = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.steps_since_food = np.zeros(n, dtype=np.int64)
+        self.frame_iteration = np.zeros(n, dtype=np.int64)
+        self.num_obstacles = np.zeros(n, dtype=np.int64)
+        self._all = np.arange(n)
+        self.reset()
+
+    def reset(self, indices=None):
+        """Reset the given boards (all by default) and return their states."""
+        rows = self._all if indices is None else np.asarray(indices, dtype=np.int64)
+        self._reset_rows(rows)
+        return self._get_states(rows)
+
+    def step(self, actions):
+        """actions: (N,) of 0=straight, 1=right, 2=left → (states, rewards, dones, infos)"""
+        actions = np.asarray(actions)
+        rows = self._all
+        self.frame_iteration += 1
+        self.steps_since_food += 1
+
+        self.dir_idx = (self.dir_idx + ACTION_TURNS[actions]) % 4
+
+        head = self.head
+        new_head = head + DIR_OFFSETS[self.dir_idx]
+        if not self.wall_kill:
+            nx, ny = to_xy(new_head)
+            new_head = to_cell(nx % COLS, ny % ROWS)
+
+        kind = self._cells[self._base + new_head]
+        collided = kind != EMPTY
+        starved = ~collided & (self.steps_since_food > self.max_steps * self.length)
+        dones = collided | starved
+        alive = ~dones
+        ate = alive & (new_head == self.food)
+        moved = alive & ~ate
+
+        fx, fy = to_xy(self.food)
+        old_dist = np.abs(CELL_X[head] - fx) + np.abs(CELL_Y[head] - fy)
+        new_dist = np.abs(CELL_X[new_head] - fx) + np.abs(CELL_Y[new_head] - fy)
+        rewards = np.where(new_dist < old_dist, 1, -1)
+        rewards[ate] = 10
+        rewards[dones] = -10
+
+        # the state a board died in is taken before anything moves
+        done_rows = rows[dones]
+        if done_rows.size:
+            final_states = self._get_states(done_rows)
+
+        # move every board; dead ones are reset below, so they need no masking
+        self.head_ptr = (self.head_ptr + 1) % self.capacity
+        self.body[rows, self.head_ptr] = new_head
+        self._cells[self._base + new_head] = BODY
+        self.head = new_head
+
+        # pop the tail where nothing was eaten
+        mv = rows[moved]
+        tail = self.body[mv, (self.head_ptr[mv] - self.length[mv]) % self.capacity]
+        self._cells[self._base[mv] + tail] = EMPTY
+
+        eaten = rows[ate]
+        full_rows = eaten[:0]
+        if eaten.size:
+            self.length[eaten] += 1
+            self.score[eaten] += 1
+            self.steps_since_food[eaten] = 0
+            self._update_level(eaten)
+            full_rows = self._place_food(eaten)
+
+        cause = KIND_CAUSES[kind]
+        cause[starved] = STARVED
+        if full_rows.size:
+            # the snake fills the board: nothing is left to eat, so the game is won
+            full_states = self._get_states(full_rows)
+            dones[full_rows] = True
+            cause[full_rows] = FULL
+        infos = {"score": self.score.copy(), "steps": self.frame_iteration.copy(), "cause": cause}
+        ended = rows[dones]
+        if ended.size:
+            self._reset_rows(ended)
+        states = self._get_states(rows)
+
+        infos["final_state"] = states
+        if ended.size:
+            infos["final_state"] = states.copy()
+            if done_rows.size:
+                infos["final_state"][done_rows] = final_states
+            if full_rows.size:
+                infos["final_state"][full_rows] = full_states
+
+        return states, rewards, dones, infos
+
+    def _get_states(self, rows):
+        """Same 11-dim layout as SnakeEnv._get_state (or its code), one row per board."""
+        head = self.head[rows]
+        d = self.dir_idx[rows]
+
+        # danger straight, right, left
+        probes = self._cells[(self._base[rows] + head)[:, None] + PROBE_OFFSETS[d]]
+        danger = self._danger_codes[probes @ PROBE_WEIGHTS]
+
+        food = self.food[rows]
+        sx = np.sign(CELL_X[food] - CELL_X[head]) + 1
+        sy = np.sign(CELL_Y[food] - CELL_Y[head]) + 1
+        codes = DIR_CODES[d] | danger | FOOD_CODES[sx, sy]
+        if self.packed:
+            return codes.astype(np.uint16)
+        return STATE_TABLE[codes]
+
+    #Helpers
+
+    def _reset_rows(self, rows):
+        self.grid[rows] = self._blank
+        self.body[rows, :3] = self._start
+        self.head[rows] = self._start[-1]
+        self.head_ptr[rows] = 2
+        self.length[rows] = 3
+        self.dir_idx[rows] = 0
+        self.score[rows] = 0
+        self.level[rows] = 1
+        self.steps_since_food[rows] = 0
+        self.frame_iteration[rows] = 0
+        self.num_obstacles[rows] = 0
+        self._place_food(rows)
+
+    def _place_food(self, rows):
+        """Place food on every board in rows; returns the boards with no free cell left."""
+        # a few vectorized rejection rounds place almost every board; any
+        # board still pending is nearly full, so pick from its free cells
+        pending = rows
+        for _ in range(4):
+            if not pending.size:
+                return pending
+            cells = to_cell(self.rng.integers(0, COLS, pending.size),
+                            self.rng.integers(0, ROWS, pending.size))
+            ok = self._cells[self._base[pending] + cells] == EMPTY
+            self.food[pending[ok]] = cells[ok]
+            pending = pending[~ok]
+        full = []
+        for i in pending:
+            free = np.flatnonzero(self.grid[i].reshape(-1) == EMPTY)
+            if free.size:
+                self.food[i] = self.rng.choice(free)
+            else:
+                full.append(i)
+        return np.array(full, dtype=rows.dtype)
+
+    def _update_level(self, rows):
+        self.level[rows] = self.score[rows] // LEVEL_UP_SCORE + 1
+        target = np.minimum((self.level[rows] - OBSTACLE_START_LEVEL + 1) * 2, MAX_OBSTACLES)
+        for i, t in zip(rows, target):
+            while self.num_obstacles[i] < t:
+                if not self._place_obstacle(i):
+                    break
+
+    def _place_obstacle(self, i):
+        # food has just been eaten, so it sits under the head and is occupied
+        hx, hy = to_xy(self.head[i])
+        for _ in range(100):
+            x = int(self.rng.integers(0, COLS))
+            y = int(self.rng.integers(0, ROWS))
+            if self.grid[i, x + 1, y + 1] == EMPTY and (abs(x - hx) > 3 or abs(y - hy) > 3):
+                self.grid[i, x + 1, y + 1] = OBSTACLE
+                self.num_obstacles[i] += 1
+                return True
+        return False
@@ -1,88 +1,285 @@
-import random
+import copy
+import os
+import time
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from collections import deque
 
 from rl.model import DQN
+from rl.replay import ReplayBuffer, PrioritizedReplayBuffer, BatchStaging
 from game.settings import (
     RL_LEARNING_RATE, RL_GAMMA,
     RL_EPSILON_START, RL_EPSILON_MIN, RL_EPSILON_DECAY,
-    RL_BATCH_SIZE, RL_MEMORY_SIZE, RL_ACTION_SIZE,
+    RL_BATCH_SIZE, RL_MEMORY_SIZE, RL_STATE_SIZE, RL_ACTION_SIZE, RL_PACKED_MEMORY,
+    RL_PRIORITIZED, RL_PER_ALPHA, RL_PER_BETA_START, RL_PER_BETA_GAMES,
+    RL_COMPILE, RL_BF16, RL_HIDDEN_1, RL_HIDDEN_2,
 )
 
 
 class DQNAgent:
 
-    def __init__(self):
+    def __init__(self, packed_memory=RL_PACKED_MEMORY, memory_size=RL_MEMORY_SIZE,
+                 prioritized=RL_PRIORITIZED, compile_model=RL_COMPILE, bf16=RL_BF16,
+                 lr=RL_LEARNING_RATE, gamma=RL_GAMMA, epsilon_start=RL_EPSILON_START,
+                 epsilon_min=RL_EPSILON_MIN, epsilon_decay=RL_EPSILON_DECAY,
+                 hidden_1=RL_HIDDEN_1, hidden_2=RL_HIDDEN_2, seed=None):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = DQN().to(self.device)
-        self.optimizer = optim.Adam(self.model.parameters(), lr=RL_LEARNING_RATE)
+        if seed is not None:
+            torch.manual_seed(seed)   # weight init
+        # independent streams for exploration and replay sampling
+        explore_seed, replay_seed = np.random.SeedSequence(seed).spawn(2)
+        self.model = DQN(hidden_1, hidden_2).to(self.device)
+        # what _train_step runs: the model itself, or a compiled wrapper
+        # sharing its parameters (so save/load and state_dict are unchanged)
+        self.train_model = torch.compile(self.model) if compile_model else self.model
+        self.bf16 = bf16
+        self.optimizer = optim.Adam(self.model.parameters(), lr=lr)
         self.criterion = nn.MSELoss()
 
-        self.memory = deque(maxlen=RL_MEMORY_SIZE)
-        self.epsilon = RL_EPSILON_START
-        self.gamma = RL_GAMMA
+        self.prioritized = prioritized
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(memory_size, alpha=RL_PER_ALPHA, device=self.device,
+                                                  seed=replay_seed, packed=packed_memory)
+        else:
+            self.memory = ReplayBuffer(memory_size, device=self.device, seed=replay_seed,
+                                       packed=packed_memory)
+        self.epsilon = epsilon_start
+        self.epsilon_min = epsilon_min
+        self.epsilon_decay = epsilon_decay
+        self.gamma = gamma
         self.n_games = 0
+        self.rng = np.random.default_rng(explore_seed)
+
+        # greedy actions come from `policy`: the model itself unless
+        # use_backend() swapped in an inference-only copy
+        self.policy = self.model
+        self.policy_device = self.device
+        self.backend = "float"
+
+        # reused every call instead of allocating per step
+        self._action_input = torch.empty((1, RL_STATE_SIZE), device=self.device)
+        self._staging = {}   # batch size → BatchStaging
+        self.prefetcher = None
+        # summed on the device, read back once per pop_loss()
+        self._loss_sum = torch.zeros((), device=self.device)
+        self._loss_count = 0
 
 
     def get_action(self, state):
-        if random.random() < self.epsilon:
-            return random.randint(0, RL_ACTION_SIZE - 1)
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(0, RL_ACTION_SIZE))
 
-        state_t = torch.tensor(state, dtype=torch.float32, device=self.device).unsqueeze(0)
-        with torch.no_grad():
-            q_values = self.model(state_t)
+        with torch.inference_mode():
+            self._action_input[0].copy_(torch.from_numpy(np.asarray(state, dtype=np.float32)))
+            q_values = self.policy(self._action_input)
         return int(torch.argmax(q_values).item())
 
+    def get_actions(self, states, epsilon=None):
+        """
+        Epsilon-greedy actions for a batch of states (N, 11) → (N,).
+
+        epsilon defaults to self.epsilon and may be an (N,) array to give
+        every env its own exploration rate. Only the greedy rows go through
+        the model, in a single forward pass.
+        """
+        states = np.asarray(states, dtype=np.float32)
+        n = len(states)
+        eps = self.epsilon if epsilon is None else np.asarray(epsilon)
+
+        actions = self.rng.integers(0, RL_ACTION_SIZE, n)
+        greedy = np.flatnonzero(self.rng.random(n) >= eps)
+        if greedy.size:
+            states_t = torch.from_numpy(states[greedy]).to(self.policy_device)
+            with torch.inference_mode():
+                q_values = self.policy(states_t)
+            actions[greedy] = q_values.argmax(dim=1).cpu().numpy()
+        return actions
+
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.push(state, action, reward, next_state, done)
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        self.memory.push_batch(states, actions, rewards, next_states, dones)
 
 
     def train_short_memory(self, state, action, reward, next_state, done):
-        self._train_step([(state, action, reward, next_state, done)])
+        self.train_batch([state], [action], [reward], [next_state], [done])
 
-    def train_long_memory(self):
-        if len(self.memory) < RL_BATCH_SIZE:
-            batch = list(self.memory)
-        else:
-            batch = random.sample(self.memory, RL_BATCH_SIZE)
-        self._train_step(batch)
+    def train_batch(self, states, actions, rewards, next_states, dones):
+        """One update on a batch of fresh transitions, e.g. one step of N envs."""
+        dev = self.device
+        self._train_step(
+            torch.as_tensor(np.asarray(states, dtype=np.float32), device=dev),
+            torch.as_tensor(np.asarray(actions, dtype=np.int64), device=dev),
+            torch.as_tensor(np.asarray(rewards, dtype=np.float32), device=dev),
+            torch.as_tensor(np.asarray(next_states, dtype=np.float32), device=dev),
+            torch.as_tensor(np.asarray(dones, dtype=np.bool_), device=dev),
+        )
+
+    def train_long_memory(self, batch_size=RL_BATCH_SIZE):
+        if len(self.memory) == 0:
+            return
+        pf = self.prefetcher
+        if pf is not None and batch_size == pf.batch_size and len(self.memory) > batch_size:
+            batch, idx, weights = pf.get()
+            start = time.perf_counter()
+            td_errors = self._train_step(*batch, weights=weights)
+            if idx is not None:
+                self.memory.update_priorities(idx, td_errors.cpu().numpy())
+            pf.record_compute(time.perf_counter() - start)
+            return
+        if not self.prioritized:
+            if len(self.memory) <= batch_size:
+                # warm-up: the whole (smaller than a batch) memory, as before
+                self._train_step(*self.memory.sample(batch_size))
+            else:
+                self._train_step(*self.memory.sample_into(self._staging_for(batch_size)))
+            return
+
+        batch, idx, weights = self.memory.sample(batch_size, self._per_beta(),
+                                                 self._staging_for(batch_size))
+        td_errors = self._train_step(*batch, weights=weights)
+        self.memory.update_priorities(idx, td_errors.cpu().numpy())
+
+    def start_prefetch(self, batch_size=RL_BATCH_SIZE, depth=2):
+        """Sample replay batches of batch_size ahead on a background thread."""
+        from rl.prefetch import BatchPrefetcher
+        self.stop_prefetch()
+        self.prefetcher = BatchPrefetcher(self.memory, batch_size, depth,
+                                          beta_fn=self._per_beta, device=self.device)
 
-    def _train_step(self, batch):
-        states, actions, rewards, next_states, dones = zip(*batch)
+    def stop_prefetch(self):
+        """Stop the prefetch thread → its wait/compute stats (None if none ran)."""
+        if self.prefetcher is None:
+            return None
+        self.prefetcher.close()
+        stats, self.prefetcher = self.prefetcher.stats(), None
+        return stats
 
-        states_t = torch.tensor(np.array(states), dtype=torch.float32, device=self.device)
-        next_states_t = torch.tensor(np.array(next_states), dtype=torch.float32, device=self.device)
-        actions_t = torch.tensor(actions, dtype=torch.long, device=self.device)
-        rewards_t = torch.tensor(rewards, dtype=torch.float32, device=self.device)
-        dones_t = torch.tensor(dones, dtype=torch.bool, device=self.device)
+    def _per_beta(self):
+        progress = min(1.0, self.n_games / RL_PER_BETA_GAMES)
+        return RL_PER_BETA_START + (1.0 - RL_PER_BETA_START) * progress
 
-        # current Q
-        q_pred = self.model(states_t).gather(1, actions_t.unsqueeze(1)).squeeze(1)
+    def _staging_for(self, batch_size):
+        staging = self._staging.get(batch_size)
+        if staging is None:
+            staging = self._staging[batch_size] = BatchStaging(batch_size, device=self.device)
+        return staging
 
-        # target Q
-        with torch.no_grad():
-            q_next = self.model(next_states_t).max(dim=1)[0]
-            q_next[dones_t] = 0.0
-        q_target = rewards_t + self.gamma * q_next
+    def _train_step(self, states_t, actions_t, rewards_t, next_states_t, dones_t, weights=None):
+        """One gradient step; returns the batch's |TD error| for priority updates."""
+        # forward passes may run in bf16; Q values are float32 from here on
+        with torch.autocast(self.device.type, dtype=torch.bfloat16, enabled=self.bf16):
+            # current Q
+            q_pred = self.train_model(states_t).float().gather(1, actions_t.unsqueeze(1)).squeeze(1)
 
-        loss = self.criterion(q_pred, q_target)
+            # target Q
+            with torch.no_grad():
+                q_next = self.train_model(next_states_t).float().max(dim=1)[0]
+        # built in place: r + gamma * max Q(s'), zero past terminal states
+        q_target = q_next.masked_fill_(dones_t, 0.0).mul_(self.gamma).add_(rewards_t)
+
+        if weights is None:
+            loss = self.criterion(q_pred, q_target)
+        else:
+            # importance-sampling weights undo the bias of prioritized sampling
+            loss = (weights * (q_pred - q_target) ** 2).mean()
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        self._loss_sum += loss.detach()
+        self._loss_count += 1
+        return (q_target - q_pred).detach().abs()
+
+    def pop_loss(self):
+        """Mean loss of the updates since the last call (None if there were none)."""
+        if not self._loss_count:
+            return None
+        loss = self._loss_sum.item() / self._loss_count
+        self._loss_sum.zero_()
+        self._loss_count = 0
+        return loss
 
     #Epsilon Decay
 
     def decay_epsilon(self):
-        self.epsilon = max(RL_EPSILON_MIN, self.epsilon * RL_EPSILON_DECAY)
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
 
 
     def save(self, path="models/snake_dqn.pth"):
         self.model.save(path)
 
-    def load(self, path="models/snake_dqn.pth"):
+    def load(self, path="models/snake_dqn.pth", backend=None):
+        """
+        Load saved weights, then optionally use_backend(backend). A file
+        written by rl.export is already an inference variant: it becomes
+        the policy as it is and the trainable model keeps its weights.
+        """
+        from rl.export import is_exported, load_exported
+
+        if os.path.exists(path) and is_exported(path):
+            if backend:
+                raise ValueError(f"{path} is an exported model; it cannot be rebuilt as backend {backend!r}")
+            self.policy, self.policy_device = load_exported(path), torch.device("cpu")
+            self.backend = "exported"
+            self._action_input = torch.empty((1, RL_STATE_SIZE), device=self.policy_device)
+            return
         self.model.load(path)
         self.model.to(self.device)
+        if backend:
+            self.use_backend(backend)
+
+    def state_dict(self, memory=True):
+        """
+        Snapshot of everything needed to resume training: weights, optimizer,
+        exploration and (optionally) replay. Every tensor is a copy, so the
+        snapshot can be written out while training goes on.
+        """
+        state = {
+            "model": {k: v.detach().cpu().clone() for k, v in self.model.state_dict().items()},
+            "optimizer": copy.deepcopy(self.optimizer.state_dict()),
+            "epsilon": self.epsilon,
+            "n_games": self.n_games,
+            "rng": self.rng.bit_generator.state,
+        }
+        if memory:
+            state["memory"] = self.memory.state_dict()
+        return state
+
+    def load_state_dict(self, state):
+        self.model.load_state_dict(state["model"])
+        self.model.to(self.device)
+        self.optimizer.load_state_dict(state["optimizer"])
+        self.epsilon = state["epsilon"]
+        self.n_games = state["n_games"]
+        self.rng.bit_generator.state = state["rng"]
+        if "memory" in state:
+            self.memory.load_state_dict(state["memory"])
+
+    def save_async(self, writer, path="models/snake_dqn.pth"):
+        """Queue a weights-only save (same file as save()) on a CheckpointWriter."""
+        weights = {k: v.detach().cpu().clone() for k, v in self.model.state_dict().items()}
+        writer.write(path, torch.save, weights)
+
+    def use_backend(self, backend="auto"):
+        """
+        Select actions with an inference-only variant of the current weights
+        (see rl.export); "auto" times the candidates and keeps the fastest.
+        The variant is a snapshot: call again after further training.
+        """
+        from rl.export import build, pick_fastest
+
+        if backend == "auto":
+            backend, policy = pick_fastest(self.model)
+        elif backend != "float":
+            policy = build(self.model, backend)
+        if backend == "float":
+            # the live model, so actions keep following training
+            self.policy, self.policy_device = self.model, self.device
+        else:
+            self.policy, self.policy_device = policy, torch.device("cpu")
+        self.backend = backend
+        self._action_input = torch.empty((1, RL_STATE_SIZE), device=self.policy_device)
+        return backend
@@ -0,0 +1,210 @@
+"""Ape-X style experience collection: actor processes feed one learner."""
+
+import os
+import queue
+import numpy as np
+import torch
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+from game.settings import RL_ACTION_SIZE, RL_APEX_EPS_BASE, RL_APEX_EPS_ALPHA
+from game.vec_env import VecSnakeEnv
+from game.state_bits import unpack_states
+from rl.model import DQN
+
+
+def actor_epsilons(count, base=RL_APEX_EPS_BASE, alpha=RL_APEX_EPS_ALPHA):
+    """Fixed per-board exploration rates base^(1 + alpha * i / (count - 1))."""
+    if count == 1:
+        return np.array([base])
+    return base ** (1 + alpha * np.arange(count) / (count - 1))
+
+
+class SharedWeights:
+    """
+    DQN parameters in one flat shared-memory float32 block.
+
+    The learner publish()es after a batch of updates, bumping `version`;
+    actors pull() only when the version has moved. A lock keeps a reader from
+    seeing a half-written copy.
+    """
+
+    def __init__(self, model, ctx, name=None, version=None, lock=None):
+        self.sizes = [p.numel() for p in model.parameters()]
+        total = sum(self.sizes)
+        self._owner = name is None
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=total * 4)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.flat = np.ndarray(total, dtype=np.float32, buffer=self.shm.buf)
+        self.version = version if version is not None else ctx.Value("q", 0, lock=False)
+        self.lock = lock if lock is not None else ctx.Lock()
+        self.seen = -1
+
+    def handles(self):
+        """What a child process needs to attach: (name, version, lock)."""
+        return self.shm.name, self.version, self.lock
+
+    def publish(self, model):
+        flat = torch.from_numpy(self.flat)
+        with self.lock, torch.no_grad():
+            torch.cat([p.detach().reshape(-1).cpu() for p in model.parameters()], out=flat)
+            self.version.value += 1
+
+    def pull(self, model):
+        """Copy newer weights into model; returns whether anything changed."""
+        if self.version.value == self.seen:
+            return False
+        flat = torch.from_numpy(self.flat)
+        with self.lock, torch.no_grad():
+            self.seen = self.version.value
+            for p, chunk in zip(model.parameters(), flat.split(self.sizes)):
+                p.copy_(chunk.view_as(p))
+        return True
+
+    def close(self):
+        self.flat = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def _actor(out, handles, stop, num_envs, epsilons, seed, chunk, wall_kill, hidden):
+    torch.set_num_threads(1)
+    model = DQN(*hidden)
+    model.eval()
+    weights = SharedWeights(model, None, *handles)
+    env = VecSnakeEnv(num_envs, wall_kill=wall_kill, seed=seed, packed=True)
+    rng = np.random.default_rng(seed)
+    n = num_envs
+
+    # one chunk of `chunk` vector steps is sent at a time, as packed codes
+    shape = (chunk, n)
+    buf = {
+        "states": np.empty(shape, dtype=np.uint16),
+        "actions": np.empty(shape, dtype=np.uint8),
+        "rewards": np.empty(shape, dtype=np.float32),
+        "next_states": np.empty(shape, dtype=np.uint16),
+        "dones": np.empty(shape, dtype=np.bool_),
+    }
+    states = env.reset()
+    try:
+        while not stop.is_set():
+            weights.pull(model)
+            scores = []
+            for t in range(chunk):
+                actions = rng.integers(0, RL_ACTION_SIZE, n)
+                greedy = np.flatnonzero(rng.random(n) >= epsilons)
+                if greedy.size:
+                    with torch.inference_mode():
+                        q_values = model(torch.from_numpy(unpack_states(states[greedy])))
+                    actions[greedy] = q_values.argmax(dim=1).numpy()
+                next_states, rewards, dones, info = env.step(actions)
+                buf["states"][t] = states
+                buf["actions"][t] = actions
+                buf["rewards"][t] = rewards
+                buf["next_states"][t] = info["final_state"]
+                buf["dones"][t] = dones
+                scores.extend(info["score"][dones].tolist())
+                states = next_states
+            batch = {k: v.reshape(-1).copy() for k, v in buf.items()}
+            # a full queue means the learner is behind; wait, but stay stoppable
+            while not stop.is_set():
+                try:
+                    out.put((batch, scores), timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        weights.close()
+
+
+class ActorPool:
+    """
+    Actor processes stepping VecSnakeEnv boards with a shared copy of the DQN.
+
+    Every board has its own fixed epsilon (actor_epsilons across all
+    num_actors * envs_per_actor boards). Actors ship chunks of packed
+    transitions through a bounded queue; poll() hands them to the learner,
+    which calls publish(model) every few updates to broadcast new weights.
+    """
+
+    def __init__(self, model, num_actors=None, envs_per_actor=8, chunk=32, wall_kill=True,
+                 seed=None, max_queued=64):
+        num_actors = num_actors or max(1, (os.cpu_count() or 2) - 1)
+        self.num_actors = num_actors
+        self.envs_per_actor = envs_per_actor
+        self.env_steps = 0
+
+        ctx = mp.get_context("spawn")
+        self.weights = SharedWeights(model, ctx)
+        self.weights.publish(model)
+        self._queue = ctx.Queue(max_queued)
+        self._stop = ctx.Event()
+
+        epsilons = actor_epsilons(num_actors * envs_per_actor).reshape(num_actors, envs_per_actor)
+        seeds = np.random.SeedSequence(seed).spawn(num_actors)
+        self._procs = []
+        for a in range(num_actors):
+            proc = ctx.Process(
+                target=_actor,
+                args=(self._queue, self.weights.handles(), self._stop, envs_per_actor,
+                      epsilons[a], seeds[a], chunk, wall_kill, model.hidden),
+                daemon=True,
+            )
+            proc.start()
+            self._procs.append(proc)
+        self._closed = False
+
+    def publish(self, model):
+        self.weights.publish(model)
+
+    def poll(self, timeout=None):
+        """
+        Every chunk waiting in the queue → list of (transitions, scores).
+
+        With a timeout, blocks up to that long for the first chunk.
+        """
+        chunks = []
+        try:
+            if timeout is not None:
+                chunks.append(self._queue.get(timeout=timeout))
+            while True:
+                chunks.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        for batch, _ in chunks:
+            self.env_steps += len(batch["actions"])
+        return chunks
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        # drain so no actor is stuck flushing into a full pipe
+        for proc in self._procs:
+            for _ in range(100):
+                if not proc.is_alive():
+                    break
+                self.poll(timeout=0.05)
+                proc.join(timeout=0.05)
+            if proc.is_alive():
+                proc.terminate()
+        self._queue.close()
+        self.weights.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,99 @@
+"""Full training-state checkpoints, written by a background thread."""
+
+import glob
+import os
+import queue
+import threading
+import torch
+
+from game.settings import RL_CHECKPOINT_DIR, RL_CHECKPOINT_KEEP
+
+
+def atomic_save(save_fn, payload, path):
+    """save_fn(payload, tmp) next to path, then rename over it in one step."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{ext}"   # keep the extension, np.savez insists on .npz
+    save_fn(payload, tmp)
+    os.replace(tmp, path)
+
+
+class CheckpointWriter:
+    """
+    Writes snapshots to disk off the training thread.
+
+    The caller hands over a snapshot it will not touch again (see
+    DQNAgent.state_dict), so the loop only pays for copying state in
+    memory. Files are written under a temporary name and renamed, so a
+    crash never leaves a half-written checkpoint, and only the newest
+    `keep` full checkpoints named <prefix>_<step>.pt are kept.
+    """
+
+    def __init__(self, directory=RL_CHECKPOINT_DIR, prefix="dqn", keep=RL_CHECKPOINT_KEEP):
+        self.directory = directory
+        self.prefix = prefix
+        self.keep = keep
+        self._jobs = queue.Queue()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, path, save_fn, payload):
+        """Queue save_fn(payload, path), atomically replacing path."""
+        self._raise_error()
+        self._jobs.put((path, save_fn, payload))
+
+    def checkpoint(self, state, step):
+        """Queue a full training state as <directory>/<prefix>_<step>.pt."""
+        path = os.path.join(self.directory, f"{self.prefix}_{step:08d}.pt")
+        self.write(path, torch.save, state)
+        self._jobs.put(self._prune)
+
+    def paths(self):
+        """Saved full checkpoints, oldest first."""
+        # only <prefix>_<digits>.pt, so "dqn" does not pick up "dqn_128x64_..." files
+        paths = glob.glob(os.path.join(self.directory, f"{self.prefix}_*.pt"))
+        return sorted(p for p in paths if os.path.basename(p)[len(self.prefix) + 1:-3].isdigit())
+
+    def load_latest(self):
+        """The newest full checkpoint's state, or None."""
+        paths = self.paths()
+        if not paths:
+            return None
+        return torch.load(paths[-1], map_location="cpu", weights_only=True)
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        self._jobs.join()
+        self._raise_error()
+
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    #Helpers
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                if callable(job):
+                    job()
+                else:
+                    atomic_save(job[1], job[2], job[0])
+            except Exception as e:
+                self._error = e
+            finally:
+                self._jobs.task_done()
+
+    def _prune(self):
+        for path in self.paths()[:-self.keep]:
+            os.remove(path)
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"checkpoint write failed: {error}") from error
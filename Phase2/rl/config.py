@@ -0,0 +1,88 @@
+"""
+Per-run hyperparameters, so several configurations can share one process.
+
+The RL_* constants in game.settings are only defaults: a RunConfig overrides
+any of them by keyword and hands the environment, DQNAgent and
+TrainSchedule their share. It round-trips through plain dicts and JSON, so
+it can be sent to worker processes and saved next to results.
+
+    python train.py --envs 64 --config sweeps/example/best.json
+"""
+
+import json
+import os
+
+from game.settings import (
+    RL_MAX_STEPS, RL_HIDDEN_1, RL_HIDDEN_2,
+    RL_LEARNING_RATE, RL_GAMMA, RL_EPSILON_START, RL_EPSILON_MIN, RL_EPSILON_DECAY,
+    RL_MEMORY_SIZE, RL_BATCH_SIZE,
+)
+from rl.schedule import TrainSchedule
+
+ENV_KEYS = ("max_steps",)
+AGENT_KEYS = ("hidden_1", "hidden_2", "lr", "gamma", "epsilon_start", "epsilon_min", "epsilon_decay",
+              "memory_size")
+SCHEDULE_KEYS = ("batch_size", "train_every", "gradient_steps")
+
+# every hyperparameter a run can set → its default
+DEFAULTS = {
+    "max_steps": RL_MAX_STEPS,
+    "hidden_1": RL_HIDDEN_1,
+    "hidden_2": RL_HIDDEN_2,
+    "lr": RL_LEARNING_RATE,
+    "gamma": RL_GAMMA,
+    "epsilon_start": RL_EPSILON_START,
+    "epsilon_min": RL_EPSILON_MIN,
+    "epsilon_decay": RL_EPSILON_DECAY,
+    "memory_size": RL_MEMORY_SIZE,
+    "batch_size": RL_BATCH_SIZE,
+    "train_every": 0,
+    "gradient_steps": 1,
+}
+
+
+class RunConfig:
+    """
+    One run's hyperparameters: DEFAULTS with any keyword overrides.
+
+    Values take the type of their default, so sizes sampled as floats
+    come out as rounded ints. Unknown names raise ValueError.
+    """
+
+    def __init__(self, **values):
+        unknown = sorted(set(values) - DEFAULTS.keys())
+        if unknown:
+            raise ValueError(f"unknown hyperparameter(s): {', '.join(unknown)} "
+                             f"(known: {', '.join(DEFAULTS)})")
+        for name, default in DEFAULTS.items():
+            value = values.get(name, default)
+            setattr(self, name, int(round(value)) if isinstance(default, int) else float(value))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in DEFAULTS}
+
+    def changed(self):
+        """The values that differ from the defaults."""
+        return {name: value for name, value in self.to_dict().items() if value != DEFAULTS[name]}
+
+    def env_kwargs(self):
+        return {name: getattr(self, name) for name in ENV_KEYS}
+
+    def agent_kwargs(self):
+        return {name: getattr(self, name) for name in AGENT_KEYS}
+
+    def schedule(self, short_memory=True):
+        return TrainSchedule(short_memory=short_memory, **{name: getattr(self, name) for name in SCHEDULE_KEYS})
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def __repr__(self):
+        return f"RunConfig({', '.join(f'{k}={v!r}' for k, v in self.changed().items())})"
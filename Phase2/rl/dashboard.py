@@ -0,0 +1,144 @@
+"""
+Live training plot in its own process, fed by the metrics log.
+
+The trainer only appends episode records to the log (see rl.metrics); a
+viewer process tails the file and redraws. The training loop never waits
+on matplotlib, so its speed is the same with or without a plot.
+
+    python -m rl.dashboard models/metrics.jsonl     # watch a run from another terminal
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from game.settings import RL_METRICS_PATH
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_viewer(path=RL_METRICS_PATH):
+    """Start a viewer process on `path` that stops following when this process exits."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "rl.dashboard", os.path.abspath(path), "--pid", str(os.getpid())],
+        cwd=ROOT, stdin=subprocess.DEVNULL)
+
+
+class Downsampled:
+    """
+    A growing series kept to at most max_points points.
+
+    Values are averaged into buckets; when the buckets outnumber
+    max_points, neighbours are merged and the bucket width doubles, so
+    memory and redraw cost stay bounded however long training runs.
+    """
+
+    def __init__(self, max_points=2000):
+        self.max_points = max_points
+        self.width = 1
+        self.x, self.y = [], []
+        self._sum = 0.0
+        self._n = 0
+        self._start = None
+
+    def add(self, x, y):
+        if self._n == 0:
+            self._start = x
+        self._sum += y
+        self._n += 1
+        if self._n == self.width:
+            self.x.append((self._start + x) / 2)
+            self.y.append(self._sum / self._n)
+            self._sum, self._n = 0.0, 0
+            if len(self.x) > self.max_points:
+                self._halve()
+
+    def points(self):
+        """Bucket centres and means, including the bucket still filling."""
+        if self._n:
+            return self.x + [self._start], self.y + [self._sum / self._n]
+        return self.x, self.y
+
+    def _halve(self):
+        if len(self.x) % 2:
+            # the odd bucket out goes back to being the one filling
+            x, y = self.x.pop(), self.y.pop()
+            self._start, self._sum, self._n = x - (self.width - 1) / 2, y * self.width, self.width
+        self.x = [(a + b) / 2 for a, b in zip(self.x[::2], self.x[1::2])]
+        self.y = [(a + b) / 2 for a, b in zip(self.y[::2], self.y[1::2])]
+        self.width *= 2
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def view(path, pid=None, interval=0.5, max_points=2000, title="RL Snake Training"):
+    """Tail `path` and plot it until the window is closed."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    if matplotlib.get_backend().lower() in ("agg", "pdf", "ps", "svg", "cairo", "template"):
+        print(f"  dashboard: no interactive matplotlib backend, not plotting {path}", file=sys.stderr)
+        return
+
+    scores, means = Downsampled(max_points), Downsampled(max_points)
+    plt.ion()
+    fig, ax = plt.subplots()
+    fig.canvas.manager.set_window_title(title)
+    ax.set_title(title)
+    ax.set_xlabel("Episode")
+    ax.set_ylabel("Score")
+    ax.grid(True, alpha=0.3)
+    score_line, = ax.plot([], [], label="Score", alpha=0.6, color="cyan")
+    mean_line, = ax.plot([], [], label="Mean Score", color="lime", linewidth=2)
+    ax.legend(loc="upper left")
+    status = ax.text(0.99, 0.01, "", transform=ax.transAxes, ha="right", va="bottom", fontsize=9)
+
+    with open(path) as f:
+        partial = ""
+        finished = False   # the trainer has exited
+        last = None
+        while plt.fignum_exists(fig.number):
+            if not finished:
+                # checked before reading, so the trainer's last flush is still picked up
+                exited = pid is not None and not _alive(pid)
+                chunk = f.read()
+                lines = (partial + chunk).split("\n")
+                partial = lines.pop()   # a line the trainer is still writing
+                for line in lines:
+                    row = json.loads(line)
+                    last = row
+                    scores.add(row["episode"], row["score"])
+                    means.add(row["episode"], row["mean_score"])
+                if lines:
+                    score_line.set_data(*scores.points())
+                    mean_line.set_data(*means.points())
+                    ax.relim()
+                    ax.autoscale_view()
+                finished = exited
+                if last is not None:
+                    status.set_text(f"ep {last['episode']}  |  score {last['score']}  |  "
+                                    f"mean {last['mean_score']:.1f}" + ("  |  done" if finished else ""))
+                fig.canvas.draw_idle()
+            plt.pause(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot a training run's metrics log live")
+    parser.add_argument("path", nargs="?", default=RL_METRICS_PATH)
+    parser.add_argument("--pid", type=int, default=None, help="Stop following once this process exits")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between redraws")
+    parser.add_argument("--max-points", type=int, default=2000, help="Points kept per line")
+    args = parser.parse_args()
+
+    try:
+        view(args.path, args.pid, args.interval, args.max_points)
+    except KeyboardInterrupt:
+        pass
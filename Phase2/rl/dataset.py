@@ -0,0 +1,256 @@
+"""
+Offline transition datasets: sharded .npy files written once, read memory-mapped.
+
+A dataset is a directory with meta.json and one sub-directory per shard,
+each holding states, actions, rewards, next_states, dones and episodes
+(global episode id of every transition, so episode boundaries survive
+shuffling) as plain .npy arrays. Readers map the shards instead of
+loading them, so a dataset can be far larger than RAM.
+
+    python -m rl.dataset generate data/random --episodes 20000 --envs 256
+    python -m rl.dataset generate data/eps10 --model models/snake_dqn.pth --epsilon 0.1
+    python -m rl.dataset generate data/random --episodes 20000 --append
+    python -m rl.dataset info data/random
+"""
+
+import argparse
+import json
+import os
+import shutil
+import numpy as np
+
+from game.settings import RL_STATE_SIZE, RL_ACTION_SIZE, RL_BATCH_SIZE
+from game.state_bits import pack_states, unpack_states
+
+FIELDS = ("states", "actions", "rewards", "next_states", "dones", "episodes")
+
+
+def _dtypes(packed):
+    state = np.uint16 if packed else np.float32
+    return {"states": state, "actions": np.uint8, "rewards": np.float32,
+            "next_states": state, "dones": np.bool_, "episodes": np.int64}
+
+
+class ShardWriter:
+    """
+    Appends transitions and flushes them to disk one shard at a time.
+
+    Only the shard being filled is held in memory. Shards are written under
+    a temporary name and renamed, and meta.json is rewritten after every
+    shard, so an interrupted run leaves a readable dataset of the shards
+    finished so far. A directory that already holds files is refused
+    (ValueError) unless append=True, which adds shards to its dataset.
+    """
+
+    def __init__(self, directory, shard_size=1_000_000, packed=True, append=False):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.packed = packed
+        self.shards = []
+        self.episodes = 0      # next episode id
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        if append and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["packed"] != packed:
+                raise ValueError(f"{directory} holds {'packed' if meta['packed'] else 'float'} states, "
+                                 f"cannot append {'packed' if packed else 'float'} ones")
+            self.shards = meta["shards"]
+            self.episodes = meta["episodes"]
+        elif os.listdir(directory) and not append:
+            raise ValueError(f"{directory} is not empty; choose a new directory or append to its dataset")
+
+        shape = (shard_size,) if packed else (shard_size, RL_STATE_SIZE)
+        self._buf = {}
+        for key, dtype in _dtypes(packed).items():
+            self._buf[key] = np.empty(shape if key.endswith("states") else (shard_size,), dtype=dtype)
+        self._fill = 0
+
+    def add_batch(self, states, actions, rewards, next_states, dones, episodes):
+        """Append N transitions; states as (N, 11) floats or (N,) codes."""
+        if self.packed:
+            states, next_states = pack_states(states), pack_states(next_states)
+        data = {"states": states, "actions": actions, "rewards": rewards,
+                "next_states": next_states, "dones": dones, "episodes": episodes}
+        n = len(actions)
+        done = 0
+        while done < n:
+            take = min(n - done, self.shard_size - self._fill)
+            for key, values in data.items():
+                self._buf[key][self._fill:self._fill + take] = values[done:done + take]
+            self._fill += take
+            done += take
+            if self._fill == self.shard_size:
+                self._flush()
+
+    def close(self):
+        if self._fill:
+            self._flush()
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    #Helpers
+
+    def _flush(self):
+        name = f"shard_{len(self.shards):05d}"
+        tmp = os.path.join(self.directory, name + ".tmp")
+        os.makedirs(tmp, exist_ok=True)
+        for key in FIELDS:
+            np.save(os.path.join(tmp, key + ".npy"), self._buf[key][:self._fill])
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            # renamed by an interrupted run but never listed in meta.json
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+        self.shards.append({"name": name, "size": self._fill})
+        self._fill = 0
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {"packed": self.packed, "state_size": RL_STATE_SIZE, "episodes": self.episodes,
+                "size": sum(s["size"] for s in self.shards), "shards": self.shards}
+        tmp = os.path.join(self.directory, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, os.path.join(self.directory, "meta.json"))
+
+
+class TransitionDataset:
+    """
+    Read side of a ShardWriter directory, every array memory-mapped.
+
+    batches() streams shuffled (states, actions, rewards, next_states,
+    dones) batches in DQNAgent.train_batch's layout, one shard at a time,
+    so only the pages a batch touches are read from disk.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.packed = self.meta["packed"]
+        self.shards = []
+        for shard in self.meta["shards"]:
+            path = os.path.join(directory, shard["name"])
+            self.shards.append({key: np.load(os.path.join(path, key + ".npy"), mmap_mode="r")
+                                for key in FIELDS})
+
+    def __len__(self):
+        return self.meta["size"]
+
+    def num_batches(self, batch_size=RL_BATCH_SIZE):
+        """Full batches per epoch (each shard's remainder is skipped)."""
+        return sum(s["size"] // batch_size for s in self.meta["shards"])
+
+    def batches(self, batch_size=RL_BATCH_SIZE, epochs=1, seed=None):
+        """Every transition once per epoch, in random order within random shards."""
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            for s in rng.permutation(len(self.shards)):
+                shard = self.shards[s]
+                order = rng.permutation(len(shard["actions"]))
+                for start in range(0, len(order) - batch_size + 1, batch_size):
+                    # sorted indices turn the gather into a forward scan of the map
+                    yield self._gather(shard, np.sort(order[start:start + batch_size]))
+
+    def sample(self, batch_size=RL_BATCH_SIZE, rng=None):
+        """One uniform random batch from the whole dataset."""
+        rng = rng or np.random.default_rng()
+        sizes = np.array([len(s["actions"]) for s in self.shards])
+        s = rng.choice(len(self.shards), p=sizes / sizes.sum())
+        idx = np.sort(rng.integers(0, sizes[s], batch_size))
+        return self._gather(self.shards[s], idx)
+
+    #Helpers
+
+    def _gather(self, shard, idx):
+        states, next_states = shard["states"][idx], shard["next_states"][idx]
+        if self.packed:
+            states, next_states = unpack_states(states), unpack_states(next_states)
+        return (states, shard["actions"][idx].astype(np.int64), shard["rewards"][idx],
+                next_states, shard["dones"][idx])
+
+
+def generate(directory, episodes=10_000, num_envs=256, policy=None, epsilon=1.0,
+             shard_size=1_000_000, seed=None, append=False):
+    """
+    Roll out VecSnakeEnv boards until `episodes` games have finished and
+    write every transition. policy is anything with get_actions(states)
+    (NumpyDQN, TablePolicy); with probability epsilon, or without a policy,
+    actions are random. With append=True the transitions are added to the
+    dataset already in directory. → number of transitions written.
+    """
+    from game.vec_env import VecSnakeEnv
+
+    env = VecSnakeEnv(num_envs, seed=seed, packed=True)
+    rng = np.random.default_rng(seed)
+    finished = 0
+    states = env.reset()
+    with ShardWriter(directory, shard_size, packed=True, append=append) as writer:
+        # episode ids carry on from the ones already written
+        start = sum(s["size"] for s in writer.shards)
+        episode_ids = writer.episodes + np.arange(num_envs, dtype=np.int64)
+        next_id = writer.episodes + num_envs
+        while finished < episodes:
+            actions = rng.integers(0, RL_ACTION_SIZE, num_envs)
+            if policy is not None:
+                greedy = np.flatnonzero(rng.random(num_envs) >= epsilon)
+                if greedy.size:
+                    actions[greedy] = policy.get_actions(unpack_states(states[greedy]))
+            next_states, rewards, dones, info = env.step(actions)
+            writer.add_batch(states, actions, rewards, info["final_state"], dones, episode_ids)
+
+            ended = np.flatnonzero(dones)
+            finished += ended.size
+            episode_ids[ended] = next_id + np.arange(ended.size)
+            next_id += ended.size
+            states = next_states
+        writer.episodes = next_id
+    return sum(s["size"] for s in writer.shards) - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate or inspect offline transition datasets")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="Roll out boards and write a sharded dataset")
+    gen.add_argument("out")
+    gen.add_argument("--episodes", type=int, default=10_000, help="Finished games to collect")
+    gen.add_argument("--envs", type=int, default=256, help="Boards stepped together")
+    gen.add_argument("--model", default=None, help="Policy (.pth or table .npz); default: random")
+    gen.add_argument("--epsilon", type=float, default=0.1, help="Random-action rate with --model")
+    gen.add_argument("--shard-size", type=int, default=1_000_000, help="Transitions per shard")
+    gen.add_argument("--seed", type=int, default=None)
+    gen.add_argument("--append", action="store_true", help="Add to the dataset already in OUT")
+    info = sub.add_parser("info", help="Summarize a dataset")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        policy = None
+        if args.model:
+            from rl.table_policy import TablePolicy
+            policy = TablePolicy.load(args.model)
+        try:
+            n = generate(args.out, args.episodes, args.envs, policy,
+                         args.epsilon if policy else 1.0, args.shard_size, args.seed, args.append)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"  {n:,d} transitions -> {args.out}")
+    else:
+        data = TransitionDataset(args.path)
+        meta = data.meta
+        print(f"  {len(data):,d} transitions in {len(data.shards)} shard(s), "
+              f"{meta['episodes']:,d} episode ids, {'packed' if data.packed else 'float'} states")
+        # one shard at a time, never the whole dataset in memory
+        reward_sum = terminals = eaten = 0
+        for shard in data.shards:
+            reward_sum += float(shard["rewards"].sum())
+            terminals += int(shard["dones"].sum())
+            eaten += int((shard["rewards"] == 10).sum())
+        print(f"  mean reward {reward_sum / max(1, len(data)):.3f}, {terminals:,d} terminal "
+              f"transitions, {eaten:,d} food eaten")
@@ -0,0 +1,120 @@
+"""
+Inference-only variants of a trained DQN for fast greedy play on CPU.
+
+    float    the model as trained
+    int8     dynamic int8 quantization of the Linear layers
+    script   TorchScript, frozen and optimized for inference
+    compile  torch.compile (long first-call warm-up)
+
+    python -m rl.export models/snake_dqn.pth
+"""
+
+import argparse
+import copy
+import os
+import time
+import warnings
+import zipfile
+import torch
+import torch.nn as nn
+
+from game.settings import RL_STATE_SIZE
+from rl.model import DQN
+
+BACKENDS = ("float", "int8", "script", "compile")
+# compile's warm-up takes tens of seconds, too slow to try on every load
+AUTO_BACKENDS = ("float", "int8", "script")
+
+
+def build(model, backend):
+    """CPU inference copy of model for backend; RuntimeError if unusable here."""
+    model = copy.deepcopy(model).cpu().eval()
+    # quantization and TorchScript warn about their deprecation on every call
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            if backend == "float":
+                built = model
+            elif backend == "int8":
+                built = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+            elif backend == "script":
+                built = torch.jit.optimize_for_inference(torch.jit.script(model))
+            elif backend == "compile":
+                built = torch.compile(model)
+            else:
+                raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+            # errors of lazy backends only show up on the first call
+            with torch.inference_mode():
+                built(torch.zeros(1, RL_STATE_SIZE))
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"backend {backend!r} unavailable: {e}") from e
+    return built
+
+
+def latency(module, batch_size=1, calls=200):
+    """Mean seconds per greedy forward at batch_size."""
+    x = torch.zeros(batch_size, RL_STATE_SIZE)
+    with torch.inference_mode():
+        module(x).argmax(dim=1)
+        start = time.perf_counter()
+        for _ in range(calls):
+            module(x).argmax(dim=1)
+    return (time.perf_counter() - start) / calls
+
+
+def pick_fastest(model, backends=AUTO_BACKENDS, batch_size=1, calls=200):
+    """Build every usable backend and time it → (name, module) of the fastest."""
+    timed = []
+    for name in backends:
+        try:
+            module = build(model, name)
+        except RuntimeError:
+            continue
+        timed.append((latency(module, batch_size, calls), name, module))
+    _, name, module = min(timed, key=lambda t: t[0])
+    return name, module
+
+
+def export(model_path="models/snake_dqn.pth", out_dir="models"):
+    """Save the int8 and TorchScript variants as loadable TorchScript files → paths."""
+    model = DQN.from_state_dict(torch.load(model_path, map_location="cpu", weights_only=True))
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for backend in ("int8", "script"):
+            module = build(model, backend)
+            if backend == "int8":
+                module = torch.jit.script(module)
+            path = os.path.join(out_dir, f"{stem}_{backend}.pt")
+            torch.jit.save(module, path)
+            paths.append(path)
+    return paths
+
+
+def is_exported(path):
+    """Whether path is a TorchScript archive (as export() writes) rather than plain weights."""
+    if not zipfile.is_zipfile(path):
+        return False
+    with zipfile.ZipFile(path) as archive:
+        return any("/code/" in name for name in archive.namelist())
+
+
+def load_exported(path):
+    """A file written by export(), ready to call on (N, 11) float tensors."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return torch.jit.load(path, map_location="cpu").eval()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export int8 and TorchScript variants of a DQN")
+    parser.add_argument("model", nargs="?", default="models/snake_dqn.pth")
+    parser.add_argument("-o", "--out-dir", default="models")
+    args = parser.parse_args()
+
+    for path in export(args.model, args.out_dir):
+        print(f"  {path} ({os.path.getsize(path):,d} bytes)")
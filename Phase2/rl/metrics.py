@@ -0,0 +1,301 @@
+"""
+Per-episode training metrics: an append-only JSONL log and constant-memory stats.
+
+Every finished episode becomes one line of the log (episode, score, length,
+epsilon, loss, mean_score, steps_per_sec, wall_s). Lines are buffered and
+written about once a second. Neither the trainer nor the CLI below ever
+holds the whole history in memory, so runs of millions of episodes are fine.
+
+    python -m rl.metrics tail models/metrics.jsonl -n 20
+    python -m rl.metrics tail models/metrics.jsonl -f        # follow a live run
+    python -m rl.metrics summary models/metrics.jsonl --window 1000
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+from game.settings import RL_METRICS_PATH, RL_METRICS_WINDOW
+
+
+class RollingStats:
+    """
+    All-time count and mean plus mean and max of the last `window` values.
+
+    add() is O(1); the window is a fixed ring, so memory does not grow with
+    the number of values seen.
+    """
+
+    def __init__(self, window=RL_METRICS_WINDOW):
+        self.window = window
+        self.count = 0
+        self.total = 0.0
+        self._ring = [0.0] * window
+        self._pos = 0
+        self._sum = 0.0
+
+    def add(self, value):
+        if self.count >= self.window:
+            self._sum -= self._ring[self._pos]
+        self._ring[self._pos] = value
+        self._sum += value
+        self._pos = (self._pos + 1) % self.window
+        if self._pos == 0:
+            self._sum = math.fsum(self._ring)   # drop accumulated rounding once per lap
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def rolling_mean(self):
+        n = min(self.count, self.window)
+        return self._sum / n if n else 0.0
+
+    @property
+    def rolling_max(self):
+        n = min(self.count, self.window)
+        return max(self._recent(n)) if n else 0.0
+
+    def state_dict(self):
+        return {"window": self.window, "count": self.count, "total": self.total,
+                "recent": self._recent(min(self.count, self.window))}
+
+    def load_state_dict(self, state):
+        self.__init__(state["window"])
+        for value in state["recent"]:
+            self.add(value)
+        self.count, self.total = state["count"], state["total"]
+
+    #Helpers
+
+    def _recent(self, n):
+        """The last n values, oldest first."""
+        ring = self._ring[self._pos:] + self._ring[:self._pos]
+        return ring[len(ring) - n:]
+
+
+class MetricsLog:
+    """
+    Buffered, append-only JSONL writer of per-episode records.
+
+    Opening a log truncates it to `start_episode` records, which drops
+    episodes played after the checkpoint a run resumes from (0 starts
+    afresh). wall_s continues from the last kept record. steps_per_sec is
+    env steps per second, re-estimated about once a second from the
+    env_steps total passed to log().
+    """
+
+    def __init__(self, path=RL_METRICS_PATH, start_episode=0, flush_every=1.0):
+        self.path = path
+        self.flush_every = flush_every
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        wall_offset = _truncate(path, start_episode)
+        self._file = open(path, "a")
+        self._pending = []
+        now = time.perf_counter()
+        self._start = now - wall_offset
+        self._next_flush = now + flush_every
+        self._rate_t, self._rate_steps, self._rate = now, None, None
+
+    def log(self, episode, score, length=None, epsilon=None, loss=None, mean_score=None, env_steps=None):
+        now = time.perf_counter()
+        self._pending.append(
+            f'{{"episode": {episode}, "score": {score}, "length": {_num(length)}, '
+            f'"epsilon": {_num(epsilon, 4)}, "loss": {_num(loss, 5)}, "mean_score": {_num(mean_score, 4)}, '
+            f'"steps_per_sec": {_num(self._steps_per_sec(env_steps, now), 1)}, '
+            f'"wall_s": {now - self._start:.3f}}}\n')
+        if now >= self._next_flush:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write("".join(self._pending))
+            self._file.flush()
+            self._pending.clear()
+        self._next_flush = time.perf_counter() + self.flush_every
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    #Helpers
+
+    def _steps_per_sec(self, env_steps, now):
+        if env_steps is None:
+            return None
+        if self._rate_steps is None:
+            self._rate_t, self._rate_steps = now, env_steps
+        elif now - self._rate_t >= 1.0:
+            self._rate = (env_steps - self._rate_steps) / (now - self._rate_t)
+            self._rate_t, self._rate_steps = now, env_steps
+        return self._rate
+
+
+def _num(value, digits=None):
+    if value is None:
+        return "null"
+    return f"{value:.{digits}f}" if digits is not None else str(value)
+
+
+def _truncate(path, episodes):
+    """Keep the first `episodes` records of path → wall_s of the last one kept."""
+    if not os.path.exists(path) or episodes == 0:
+        open(path, "w").close()
+        return 0.0
+    wall = 0.0
+    with open(path, "rb+") as f:
+        offset = 0
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                break   # a line cut short by a crash
+            if row["episode"] > episodes:
+                break
+            wall = row["wall_s"]
+            offset += len(line)
+        f.truncate(offset)
+    return wall
+
+
+def read(path):
+    """Records of a log, one at a time."""
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                return
+
+
+def tail(path, n=10):
+    """The last n records, read backwards from the end of the file."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(64 * 1024, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()[-n:] if n else []
+    rows = []
+    for line in lines:
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            pass   # the cut-off first line of the chunk, or one still being written
+    return rows
+
+
+def summarize(path, window=RL_METRICS_WINDOW, rows=10):
+    """
+    One streaming pass → overall stats, the last `window` episodes, and a
+    progress table of `rows` equal blocks of episodes.
+    """
+    with open(path, "rb") as f:
+        count = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+    block = max(1, math.ceil(count / rows)) if count else 1
+
+    scores, lengths = RollingStats(window), RollingStats(window)
+    record = 0
+    last = None
+    table, acc = [], None
+    for row in read(path):
+        scores.add(row["score"])
+        if row["length"] is not None:
+            lengths.add(row["length"])
+        record = max(record, row["score"])
+        last = row
+        if acc is None:
+            acc = {"first": row["episode"], "n": 0, "score": 0.0, "length": 0.0, "length_n": 0,
+                   "loss": 0.0, "loss_n": 0}
+        acc["n"] += 1
+        acc["score"] += row["score"]
+        if row["length"] is not None:
+            acc["length"] += row["length"]
+            acc["length_n"] += 1
+        if row["loss"] is not None:
+            acc["loss"] += row["loss"]
+            acc["loss_n"] += 1
+        if acc["n"] == block:
+            table.append(_block_row(acc, row))
+            acc = None
+    if acc is not None:
+        table.append(_block_row(acc, last))
+    return {"episodes": scores.count, "wall_s": last["wall_s"] if last else 0.0, "record": record,
+            "mean_score": scores.mean, "window": window, "recent_mean_score": scores.rolling_mean,
+            "recent_max_score": scores.rolling_max,
+            "recent_mean_length": lengths.rolling_mean if lengths.count else None,
+            "last": last, "blocks": table}
+
+
+def _block_row(acc, last):
+    return {"episodes": f"{acc['first']}-{last['episode']}", "mean_score": acc["score"] / acc["n"],
+            "mean_length": acc["length"] / acc["length_n"] if acc["length_n"] else None,
+            "mean_loss": acc["loss"] / acc["loss_n"] if acc["loss_n"] else None,
+            "epsilon": last["epsilon"], "steps_per_sec": last["steps_per_sec"], "wall_s": last["wall_s"]}
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else "-".rjust(len(format(0, spec)))
+
+
+def _print_rows(rows):
+    for r in rows:
+        print(f"  Ep {r['episode']:>8d}  |  Score: {r['score']:>3d}  |  Len: {_fmt(r['length'], '>5d')}  |  "
+              f"Mean: {_fmt(r['mean_score'], '>6.1f')}  |  ε: {_fmt(r['epsilon'], '.3f')}  |  "
+              f"Loss: {_fmt(r['loss'], '>8.3f')}  |  {_fmt(r['steps_per_sec'], '>8,.0f')} steps/s  |  "
+              f"{r['wall_s']:>9.1f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect a training metrics log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    t = sub.add_parser("tail", help="Print the last records")
+    t.add_argument("path", nargs="?", default=RL_METRICS_PATH)
+    t.add_argument("-n", type=int, default=10, help="Records to show")
+    t.add_argument("-f", "--follow", action="store_true", help="Keep printing new records")
+    s = sub.add_parser("summary", help="Overall and recent stats plus a progress table")
+    s.add_argument("path", nargs="?", default=RL_METRICS_PATH)
+    s.add_argument("--window", type=int, default=RL_METRICS_WINDOW, help="Episodes in the recent stats")
+    s.add_argument("--rows", type=int, default=10, help="Blocks in the progress table")
+    args = parser.parse_args()
+
+    if args.command == "tail":
+        _print_rows(tail(args.path, args.n))
+        if args.follow:
+            try:
+                with open(args.path) as f:
+                    f.seek(0, os.SEEK_END)
+                    partial = ""
+                    while True:
+                        lines = (partial + f.read()).split("\n")
+                        partial = lines.pop()
+                        _print_rows([json.loads(line) for line in lines if line])
+                        sys.stdout.flush()
+                        time.sleep(0.5)
+            except KeyboardInterrupt:
+                pass
+    else:
+        s = summarize(args.path, args.window, args.rows)
+        if not s["episodes"]:
+            sys.exit(f"  {args.path}: no episodes")
+        print(f"  {s['episodes']:,d} episodes in {s['wall_s']:,.1f} s  |  record {s['record']}  |  "
+              f"mean score {s['mean_score']:.2f}")
+        print(f"  last {min(s['window'], s['episodes']):,d}: mean score {s['recent_mean_score']:.2f}, "
+              f"max {s['recent_max_score']:.0f}, mean length {_fmt(s['recent_mean_length'], '.1f')}")
+        print("-" * 78)
+        print(f"  {'episodes':>19s} {'score':>7s} {'length':>8s} {'loss':>9s} {'ε':>6s} {'steps/s':>9s} {'wall s':>9s}")
+        for b in s["blocks"]:
+            print(f"  {b['episodes']:>19s} {b['mean_score']:>7.2f} {_fmt(b['mean_length'], '>8.1f')} "
+                  f"{_fmt(b['mean_loss'], '>9.4f')} {_fmt(b['epsilon'], '>6.3f')} "
+                  f"{_fmt(b['steps_per_sec'], '>9,.0f')} {b['wall_s']:>9.1f}")
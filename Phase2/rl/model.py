@@ -7,16 +7,24 @@ from game.settings import RL_STATE_SIZE, RL_ACTION_SIZE, RL_HIDDEN_1, RL_HIDDEN_
 
 class DQN(nn.Module):
 
-    def __init__(self):
+    def __init__(self, hidden_1=RL_HIDDEN_1, hidden_2=RL_HIDDEN_2):
         super().__init__()
+        self.hidden = (hidden_1, hidden_2)
         self.net = nn.Sequential(
-            nn.Linear(RL_STATE_SIZE, RL_HIDDEN_1),
+            nn.Linear(RL_STATE_SIZE, hidden_1),
             nn.ReLU(),
-            nn.Linear(RL_HIDDEN_1, RL_HIDDEN_2),
+            nn.Linear(hidden_1, hidden_2),
             nn.ReLU(),
-            nn.Linear(RL_HIDDEN_2, RL_ACTION_SIZE),
+            nn.Linear(hidden_2, RL_ACTION_SIZE),
         )
 
+    @classmethod
+    def from_state_dict(cls, state):
+        """A DQN sized to fit saved weights, with them loaded."""
+        model = cls(state["net.0.weight"].shape[0], state["net.2.weight"].shape[0])
+        model.load_state_dict(state)
+        return model
+
     def forward(self, x):
         return self.net(x)
 
@@ -0,0 +1,129 @@
+"""
+DQN inference in plain NumPy, reading checkpoints without importing torch.
+
+torch.save writes a zip holding a pickled state dict whose tensors point
+at raw little-endian storage files. read_checkpoint() unpickles it with a
+whitelist that rebuilds those tensors as NumPy arrays, so nothing from
+torch is ever imported or executed.
+
+    python -m rl.numpy_dqn models/snake_dqn.pth -o models/snake_dqn.npz
+"""
+
+import argparse
+import os
+import pickle
+import zipfile
+from collections import OrderedDict
+import numpy as np
+
+from game.state_bits import STATE_TABLE
+
+# torch storage class name → dtype of its elements
+_STORAGE_DTYPES = {
+    "FloatStorage": np.float32,
+    "DoubleStorage": np.float64,
+    "HalfStorage": np.float16,
+    "LongStorage": np.int64,
+    "IntStorage": np.int32,
+    "ShortStorage": np.int16,
+    "CharStorage": np.int8,
+    "ByteStorage": np.uint8,
+    "BoolStorage": np.bool_,
+}
+
+LAYERS = ("net.0", "net.2", "net.4")   # the Linear layers of DQN.net
+
+
+def _rebuild_tensor(storage, offset, size, stride, *_):
+    itemsize = storage.itemsize
+    return np.lib.stride_tricks.as_strided(
+        storage[offset:], shape=tuple(size), strides=tuple(s * itemsize for s in stride)).copy()
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, archive, prefix):
+        super().__init__(file)
+        self.archive = archive
+        self.prefix = prefix
+
+    def find_class(self, module, name):
+        if module == "collections" and name == "OrderedDict":
+            return OrderedDict
+        if module == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _rebuild_tensor
+        if module == "torch" and name in _STORAGE_DTYPES:
+            return name
+        raise pickle.UnpicklingError(f"unexpected object in checkpoint: {module}.{name}")
+
+    def persistent_load(self, pid):
+        # ('storage', storage class, key, location, numel)
+        _, storage, key, _, numel = pid
+        raw = self.archive.read(f"{self.prefix}/data/{key}")
+        return np.frombuffer(raw, dtype=np.dtype(_STORAGE_DTYPES[storage]).newbyteorder("<"),
+                             count=numel)
+
+
+def read_checkpoint(path):
+    """State dict of a torch.save'd .pth (zip format) → {name: ndarray}."""
+    if not zipfile.is_zipfile(path):
+        raise ValueError(f"{path}: not a zip-format torch checkpoint")
+    with zipfile.ZipFile(path) as archive:
+        pkl = next(n for n in archive.namelist() if n.endswith("/data.pkl"))
+        prefix = pkl[:-len("/data.pkl")]
+        with archive.open(pkl) as f:
+            return dict(_Unpickler(f, archive, prefix).load())
+
+
+class NumpyDQN:
+    """Forward pass of DQN (Linear-ReLU-Linear-ReLU-Linear) on NumPy arrays."""
+
+    def __init__(self, weights):
+        self.layers = [(np.ascontiguousarray(weights[f"{name}.weight"].T, dtype=np.float32),
+                        np.asarray(weights[f"{name}.bias"], dtype=np.float32))
+                       for name in LAYERS]
+
+    @classmethod
+    def load(cls, path="models/snake_dqn.pth"):
+        """From a torch checkpoint or an .npz written by save()."""
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                return cls(dict(data))
+        return cls(read_checkpoint(path))
+
+    def save(self, path="models/snake_dqn.npz"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {}
+        for name, (w, b) in zip(LAYERS, self.layers):
+            arrays[f"{name}.weight"] = w.T
+            arrays[f"{name}.bias"] = b
+        np.savez(path, **arrays)
+
+    def forward(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        last = len(self.layers) - 1
+        for i, (w, b) in enumerate(self.layers):
+            x = x @ w + b
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def get_action(self, state):
+        return int(self.forward(state).argmax())
+
+    def get_actions(self, states):
+        return self.forward(states).argmax(axis=-1)
+
+    def q_table(self):
+        """Q values of every state code, (2048, 3)."""
+        return self.forward(STATE_TABLE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a DQN checkpoint to NumPy weights")
+    parser.add_argument("model", nargs="?", default="models/snake_dqn.pth")
+    parser.add_argument("-o", "--out", default="models/snake_dqn.npz")
+    args = parser.parse_args()
+
+    NumpyDQN.load(args.model).save(args.out)
+    print(f"  {args.model} -> {args.out} ({os.path.getsize(args.out):,d} bytes)")
@@ -0,0 +1,110 @@
+"""Replay batches sampled ahead of time on a background thread."""
+
+import queue
+import threading
+import time
+
+from rl.replay import BatchStaging, PrioritizedReplayBuffer
+
+
+class BatchPrefetcher:
+    """
+    Keeps up to `depth` replay batches sampled and staged ahead of the learner.
+
+    A worker thread fills BatchStaging buffers (pinned on CUDA) from the
+    replay under its lock, so get() normally returns at once. A staging
+    area goes back to the worker on the next get(), once the update that
+    used it is done. For prioritized replay, beta_fn() supplies beta and
+    batches carry their slots and weights; priorities are at most `depth`
+    updates stale.
+
+    get() times how long the learner waited; record_compute() takes the
+    time spent on the update itself, so stats() splits the two. If the
+    worker fails, get() raises its error instead of waiting forever, and
+    close() raises it if get() never did.
+    """
+
+    def __init__(self, memory, batch_size, depth=2, beta_fn=None, device="cpu"):
+        self.memory = memory
+        self.batch_size = batch_size
+        self.beta_fn = beta_fn
+        self._free = queue.Queue()
+        for _ in range(depth + 1):
+            self._free.put(BatchStaging(batch_size, device=device))
+        self._ready = queue.Queue()
+        self._in_use = None
+        self._stop = threading.Event()
+        self._error = None
+        self._reported = False
+
+        self.batches = 0
+        self.wait_time = 0.0
+        self.compute_time = 0.0
+        self.sample_time = 0.0   # spent in the worker thread
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get(self):
+        """Next batch → (tensors, slots, weights); slots and weights are None for uniform replay."""
+        if self._in_use is not None:
+            self._free.put(self._in_use)
+        self._in_use = None
+        start = time.perf_counter()
+        item = self._ready.get()
+        self.wait_time += time.perf_counter() - start
+        if item is None:
+            self._ready.put(None)   # the worker is gone; later calls fail the same way
+            self._reported = True
+            self._raise_error()
+        self._in_use, batch = item
+        self.batches += 1
+        return batch
+
+    def record_compute(self, seconds):
+        self.compute_time += seconds
+
+    def stats(self):
+        busy = self.wait_time + self.compute_time
+        return {"batches": self.batches, "wait_s": self.wait_time, "compute_s": self.compute_time,
+                "sample_s": self.sample_time, "wait_share": self.wait_time / busy if busy else 0.0}
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        if not self._reported:
+            self._raise_error()
+
+    #Helpers
+
+    def _run(self):
+        try:
+            self._fill()
+        except Exception as e:
+            self._error = e
+            self._ready.put(None)
+
+    def _fill(self):
+        prioritized = isinstance(self.memory, PrioritizedReplayBuffer)
+        while not self._stop.is_set():
+            try:
+                staging = self._free.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            # wait for enough experience, as train_long_memory would
+            while len(self.memory) <= self.batch_size and not self._stop.is_set():
+                time.sleep(0.001)
+            if self._stop.is_set():
+                break
+            start = time.perf_counter()
+            with self.memory.lock:
+                if prioritized:
+                    batch = self.memory.sample(self.batch_size, self.beta_fn(), staging)
+                else:
+                    batch = (self.memory.sample_into(staging), None, None)
+            self.sample_time += time.perf_counter() - start
+            self._ready.put((staging, batch))
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"replay prefetch failed: {self._error}") from self._error
@@ -0,0 +1,171 @@
+"""Where a training episode's time goes: per-phase timers and a cProfile window."""
+
+import cProfile
+import contextlib
+import json
+import os
+import time
+import numpy as np
+
+# log-spaced per-call histogram: 0.1 us to 100 s, 20 bins per decade
+_EDGES = np.logspace(-7, 2, 9 * 20 + 1)
+_NULL = contextlib.nullcontext()
+
+
+class PhaseProfiler:
+    """
+    Wall time per training phase, folded into per-episode totals.
+
+    wrap() swaps an object's methods for timed versions on that instance
+    only; phase() times a block. Call durations are kept for the current
+    episode and folded into totals and a log-spaced histogram (for p95) by
+    end_episode(), so memory stays flat over long runs. Per-episode rows
+    are only kept (for dump()) with keep_episodes. Disabled, wrap() is a
+    no-op and phase() returns a shared null context, so the hot path is
+    left as it was.
+    """
+
+    def __init__(self, enabled=True, keep_episodes=False):
+        self.enabled = enabled
+        self.keep_episodes = keep_episodes
+        self.phases = []           # in first-seen order
+        self.episodes = []         # per episode, with keep_episodes: {"wall_s": .., phase: seconds}
+        self.episode_count = 0
+        self.wall_time = 0.0
+        self._calls = {}           # phase → durations this episode
+        self._count = {}
+        self._total = {}
+        self._hist = {}
+        self._episode_start = time.perf_counter()
+
+    def wrap(self, obj, *names, prefix=""):
+        """Time every call of obj.<name> as phase prefix + name."""
+        if not self.enabled:
+            return
+        for name in names:
+            setattr(obj, name, self._timed(prefix + name, getattr(obj, name)))
+
+    def phase(self, name):
+        """Context manager timing a block as `name`."""
+        if not self.enabled:
+            return _NULL
+        return self._block(self._durations(name))
+
+    def end_episode(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        row = {"wall_s": now - self._episode_start}
+        for name, calls in self._calls.items():
+            if calls:
+                d = np.array(calls)
+                row[name] = float(d.sum())
+                self._count[name] += len(d)
+                self._total[name] += row[name]
+                self._hist[name] += np.histogram(d, _EDGES)[0]
+                calls.clear()
+        self.episode_count += 1
+        self.wall_time += row["wall_s"]
+        if self.keep_episodes:
+            self.episodes.append(row)
+        self._episode_start = now
+
+    def summary(self):
+        """Per phase → calls, mean/p95 microseconds, share of wall time; plus 'other'."""
+        wall = self.wall_time
+        rows = []
+        for name in self.phases:
+            n = self._count[name]
+            if not n:
+                continue
+            rows.append({"phase": name, "calls": n, "total_s": self._total[name],
+                         "mean_us": self._total[name] / n * 1e6, "p95_us": self._p95(name) * 1e6,
+                         "share": self._total[name] / wall if wall else 0.0})
+        timed = sum(r["total_s"] for r in rows)
+        rows.append({"phase": "other", "calls": None, "total_s": wall - timed, "mean_us": None,
+                     "p95_us": None, "share": (wall - timed) / wall if wall else 0.0})
+        return {"episodes": self.episode_count, "wall_s": wall, "phases": rows}
+
+    def print_summary(self):
+        s = self.summary()
+        if not s["episodes"]:
+            return
+        print(f"  {'phase':<20s} {'calls':>10s} {'mean us':>10s} {'p95 us':>10s} {'share':>7s}")
+        for r in s["phases"]:
+            if r["calls"] is None:
+                print(f"  {r['phase']:<20s} {'':>10s} {'':>10s} {'':>10s} {r['share']:>7.1%}")
+            else:
+                print(f"  {r['phase']:<20s} {r['calls']:>10,d} {r['mean_us']:>10.1f} "
+                      f"{r['p95_us']:>10.1f} {r['share']:>7.1%}")
+        print(f"  {s['wall_s']:.2f} s over {s['episodes']} episodes "
+              f"({s['wall_s'] / s['episodes'] * 1e3:.1f} ms per episode)")
+
+    def dump(self, path):
+        """Summary plus the per-episode breakdown (empty without keep_episodes) as JSON."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({**self.summary(), "per_episode": self.episodes}, f, indent=1)
+
+    #Helpers
+
+    def _durations(self, name):
+        if name not in self._calls:
+            self.phases.append(name)
+            self._calls[name] = []
+            self._count[name] = 0
+            self._total[name] = 0.0
+            self._hist[name] = np.zeros(len(_EDGES) - 1, dtype=np.int64)
+        return self._calls[name]
+
+    def _timed(self, name, fn):
+        append = self._durations(name).append
+        perf = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                append(perf() - start)
+        return timed
+
+    @contextlib.contextmanager
+    def _block(self, durations):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    def _p95(self, name):
+        hist = self._hist[name]
+        b = int(np.searchsorted(np.cumsum(hist), 0.95 * hist.sum()))
+        return float(np.sqrt(_EDGES[b] * _EDGES[b + 1]))   # geometric bin centre
+
+
+class CaptureWindow:
+    """
+    cProfile over one episode, written as a .prof file (pstats, snakeviz).
+
+    The window's start and end are printed with the pid so an external
+    sampler such as py-spy can be pointed at the same episode.
+    """
+
+    def __init__(self, episode, path):
+        self.episode = episode
+        self.path = path
+        self._profile = None
+
+    def begin(self, episode):
+        if episode == self.episode:
+            print(f"  Capturing episode {episode} (pid {os.getpid()})...")
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def end(self, episode):
+        if self._profile is not None and episode == self.episode:
+            self._profile.disable()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._profile.dump_stats(self.path)
+            self._profile = None
+            print(f"  Episode {episode} profile -> {self.path} (python -m pstats {self.path})")
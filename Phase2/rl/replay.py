@@ -0,0 +1,316 @@
+import threading
+import numpy as np
+import torch
+
+from game.settings import RL_STATE_SIZE
+from game.state_bits import STATE_TABLE, pack_states, unpack_states
+
+
+class BatchStaging:
+    """
+    Preallocated tensors for one fixed-size training batch.
+
+    ReplayBuffer.sample_into fills them in place (through NumPy views of the
+    CPU tensors), so a steady-state update allocates no batch memory. On
+    CUDA the CPU side is pinned and copied asynchronously into matching
+    device tensors; refill() waits for that copy before the host side is
+    written again.
+    """
+
+    def __init__(self, batch_size, state_size=RL_STATE_SIZE, device="cpu"):
+        self.batch_size = batch_size
+        self.device = torch.device(device)
+        pin = self.device.type == "cuda"
+
+        def empty(*shape, dtype=torch.float32):
+            return torch.empty(shape, dtype=dtype, pin_memory=pin)
+
+        self.host = (
+            empty(batch_size, state_size),
+            empty(batch_size, dtype=torch.long),
+            empty(batch_size),
+            empty(batch_size, state_size),
+            empty(batch_size, dtype=torch.bool),
+        )
+        self.states, self.actions, self.rewards, self.next_states, self.dones = (
+            t.numpy() for t in self.host)
+        if pin:
+            self.tensors = tuple(torch.empty_like(t, device=self.device) for t in self.host)
+            self._uploaded = torch.cuda.Event()
+        else:
+            self.tensors = self.host
+            self._uploaded = None
+
+        # scratch for index draws and narrow-dtype gathers
+        self.uniform = np.empty(batch_size, dtype=np.float64)
+        self.idx = np.empty(batch_size, dtype=np.int64)
+        self.codes = np.empty(batch_size, dtype=np.uint16)
+        self.actions_u8 = np.empty(batch_size, dtype=np.uint8)
+
+    def refill(self):
+        """Block until the last upload has left the host buffers, so they can be overwritten."""
+        if self._uploaded is not None:
+            self._uploaded.synchronize()
+
+    def upload(self):
+        if self.tensors is not self.host:
+            for dst, src in zip(self.tensors, self.host):
+                dst.copy_(src, non_blocking=True)
+            self._uploaded.record()
+        return self.tensors
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring of transitions in preallocated contiguous arrays.
+
+    Inserting overwrites the oldest slot in O(1) and sampling draws a vector
+    of indices, so its cost does not depend on how full the buffer is.
+
+    With packed=True states are stored as uint16 codes (see game.state_bits)
+    and expanded to float32 only for the sampled batch: 10 bytes per
+    transition instead of 94.
+    """
+
+    def __init__(self, capacity, state_size=RL_STATE_SIZE, device="cpu", seed=None, packed=False):
+        self.capacity = capacity
+        self.device = torch.device(device)
+        self.rng = np.random.default_rng(seed)
+        self.packed = packed
+
+        state_shape = (capacity,) if packed else (capacity, state_size)
+        state_dtype = np.uint16 if packed else np.float32
+        self.states = np.zeros(state_shape, dtype=state_dtype)
+        self.next_states = np.zeros(state_shape, dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=np.uint8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+
+        self.pos = 0      # next slot to write
+        self.size = 0
+        # held by writers and by a BatchPrefetcher sampling from another thread
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        if self.packed:
+            state, next_state = pack_states(state), pack_states(next_state)
+        with self.lock:
+            i = self.pos
+            self.states[i] = state
+            self.actions[i] = action
+            self.rewards[i] = reward
+            self.next_states[i] = next_state
+            self.dones[i] = done
+            self.pos = (i + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Insert N transitions at once, wrapping around the ring as needed."""
+        if self.packed:
+            states, next_states = pack_states(states), pack_states(next_states)
+        n = len(actions)
+        with self.lock:
+            idx = (self.pos + np.arange(n)) % self.capacity
+            self.states[idx] = states
+            self.actions[idx] = actions
+            self.rewards[idx] = rewards
+            self.next_states[idx] = next_states
+            self.dones[idx] = dones
+            self.pos = (self.pos + n) % self.capacity
+            self.size = min(self.size + n, self.capacity)
+
+    def sample_indices(self, batch_size):
+        # like the old deque path, a buffer smaller than a batch is used whole
+        if self.size <= batch_size:
+            return np.arange(self.size)
+        return self.rng.integers(0, self.size, batch_size)
+
+    def sample(self, batch_size):
+        """Random batch → (states, actions, rewards, next_states, dones) tensors."""
+        return self.gather(self.sample_indices(batch_size))
+
+    def gather(self, idx):
+        dev = self.device
+        states, next_states = self.states[idx], self.next_states[idx]
+        if self.packed:
+            states, next_states = unpack_states(states), unpack_states(next_states)
+        return (
+            torch.from_numpy(states).to(dev),
+            torch.from_numpy(self.actions[idx].astype(np.int64)).to(dev),
+            torch.from_numpy(self.rewards[idx]).to(dev),
+            torch.from_numpy(next_states).to(dev),
+            torch.from_numpy(self.dones[idx]).to(dev),
+        )
+
+    def sample_into(self, staging):
+        """Random batch written into a BatchStaging in place → its tensors."""
+        self.rng.random(out=staging.uniform)
+        staging.uniform *= self.size
+        np.copyto(staging.idx, staging.uniform, casting="unsafe")   # floor
+        return self.gather_into(staging.idx, staging)
+
+    def gather_into(self, idx, staging):
+        st = staging
+        st.refill()
+        # mode="clip" lets np.take write straight into out without buffering
+        if self.packed:
+            np.take(self.states, idx, out=st.codes, mode="clip")
+            np.take(STATE_TABLE, st.codes, axis=0, out=st.states, mode="clip")
+            np.take(self.next_states, idx, out=st.codes, mode="clip")
+            np.take(STATE_TABLE, st.codes, axis=0, out=st.next_states, mode="clip")
+        else:
+            np.take(self.states, idx, axis=0, out=st.states, mode="clip")
+            np.take(self.next_states, idx, axis=0, out=st.next_states, mode="clip")
+        np.take(self.actions, idx, out=st.actions_u8, mode="clip")
+        np.copyto(st.actions, st.actions_u8)
+        np.take(self.rewards, idx, out=st.rewards, mode="clip")
+        np.take(self.dones, idx, out=st.dones, mode="clip")
+        return st.upload()
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.states, self.next_states,
+                                      self.actions, self.rewards, self.dones))
+
+    def state_dict(self):
+        """Copy of the filled part of the ring, oldest transition first, as tensors."""
+        n = self.size
+        slots = self._filled_slots()
+        # rows are in order, so the state loads into a buffer of any capacity
+        state = {"pos": n, "size": n, "packed": self.packed}
+        for key in ("states", "actions", "rewards", "next_states", "dones"):
+            state[key] = torch.from_numpy(getattr(self, key)[slots])
+        return state
+
+    def load_state_dict(self, state):
+        """Restore a state_dict(); a smaller buffer keeps only the newest transitions."""
+        rows = self._rows_to_load(state)
+        n = len(rows)
+        for key in ("states", "actions", "rewards", "next_states", "dones"):
+            values = state[key].numpy()[rows]
+            if key.endswith("states") and state["packed"] != self.packed:
+                # saved with the other --packed setting; convert the layout
+                values = pack_states(values) if self.packed else unpack_states(values)
+            getattr(self, key)[:n] = values
+        self.size = n
+        self.pos = n % self.capacity
+
+    def _filled_slots(self):
+        """Ring slots holding transitions, oldest first."""
+        return (self.pos - self.size + np.arange(self.size)) % self.capacity
+
+    def _rows_to_load(self, state):
+        """Rows of a saved state, oldest first, cut to the newest that fit this buffer."""
+        n = state["size"]
+        # older states hold the raw ring, whose oldest row sits at pos once it is full
+        rows = (state["pos"] + np.arange(n)) % max(n, 1)
+        return rows[n - min(n, self.capacity):]
+
+
+class SumTree:
+    """
+    Binary tree of priorities where each node holds the sum of its children.
+
+    Leaves are padded to a power of two so the tree is a flat array (root at
+    1, children of i at 2i and 2i+1). Batched updates and prefix-sum lookups
+    walk one level at a time, so both cost O(log n) per element.
+    """
+
+    def __init__(self, capacity):
+        self.leaves = 1 << max(0, capacity - 1).bit_length()
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, idx):
+        return self.tree[np.asarray(idx) + self.leaves]
+
+    def update(self, idx, priorities):
+        nodes = np.asarray(idx, dtype=np.int64) + self.leaves
+        self.tree[nodes] = priorities
+        # parents are recomputed from their children rather than adjusted by
+        # deltas, so indices repeated within a batch are harmless
+        while nodes[0] > 1:
+            nodes //= 2
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Leaf index whose prefix-sum interval contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaves:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            right = values > left_sum
+            values = np.where(right, values - left_sum, values)
+            nodes = np.where(right, left + 1, left)
+        return nodes - self.leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    ReplayBuffer that samples transitions in proportion to priority^alpha.
+
+    New transitions get the largest priority seen so far; after an update
+    the learner reports |TD error| for the batch through update_priorities.
+    sample() also returns the sampled slots and importance-sampling weights
+    (normalized to a max of 1) for the given beta.
+    """
+
+    def __init__(self, capacity, alpha=0.6, eps=1e-3, **kwargs):
+        super().__init__(capacity, **kwargs)
+        self.alpha = alpha
+        self.eps = eps
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity)
+
+    def push(self, state, action, reward, next_state, done):
+        with self.lock:
+            slot = self.pos
+            super().push(state, action, reward, next_state, done)
+            self.tree.update([slot], self.max_priority ** self.alpha)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        with self.lock:
+            slots = (self.pos + np.arange(len(actions))) % self.capacity
+            super().push_batch(states, actions, rewards, next_states, dones)
+            self.tree.update(slots, self.max_priority ** self.alpha)
+
+    def sample(self, batch_size, beta=0.4, staging=None):
+        """Prioritized batch → (tensors, slots, importance weights tensor)."""
+        total = self.tree.total()
+        # one draw per equal slice of the total keeps the batch spread out
+        targets = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        idx = np.minimum(self.tree.find(targets), self.size - 1)
+
+        probs = self.tree.get(idx) / total
+        weights = (self.size * probs) ** -beta
+        weights /= weights.max()
+        weights_t = torch.from_numpy(weights.astype(np.float32)).to(self.device)
+        batch = self.gather(idx) if staging is None else self.gather_into(idx, staging)
+        return batch, idx, weights_t
+
+    def state_dict(self):
+        state = super().state_dict()
+        state["priorities"] = torch.from_numpy(self.tree.get(self._filled_slots()))
+        state["max_priority"] = self.max_priority
+        return state
+
+    def load_state_dict(self, state):
+        super().load_state_dict(state)
+        self.tree = SumTree(self.capacity)
+        # a uniform buffer's state has no priorities: treat everything as new
+        self.max_priority = state.get("max_priority", 1.0)
+        if "priorities" in state and self.size:
+            self.tree.update(np.arange(self.size), state["priorities"].numpy()[self._rows_to_load(state)])
+        elif self.size:
+            self.tree.update(np.arange(self.size), self.max_priority ** self.alpha)
+
+    def update_priorities(self, idx, td_errors):
+        priorities = np.abs(td_errors) + self.eps
+        with self.lock:
+            self.max_priority = max(self.max_priority, float(priorities.max()))
+            self.tree.update(idx, priorities ** self.alpha)
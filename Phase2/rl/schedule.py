@@ -0,0 +1,49 @@
+from game.settings import RL_BATCH_SIZE
+
+
+class TrainSchedule:
+    """
+    Decides when the agent learns while experience is being collected.
+
+    train_every=0 keeps the original recipe: one replay batch at the end of
+    each episode. train_every=K instead runs `gradient_steps` replay updates
+    of `batch_size` every K env steps (counted across all boards) and skips
+    the end-of-episode batch. short_memory toggles the batch-of-one update
+    after every step.
+    """
+
+    def __init__(self, train_every=0, gradient_steps=1, batch_size=RL_BATCH_SIZE, short_memory=True):
+        if train_every < 0 or gradient_steps < 1 or batch_size < 1:
+            raise ValueError(f"train_every must be >= 0 and gradient_steps, batch_size >= 1 "
+                             f"(got {train_every}, {gradient_steps}, {batch_size})")
+        self.train_every = train_every
+        self.gradient_steps = gradient_steps
+        self.batch_size = batch_size
+        self.short_memory = short_memory
+        self.env_steps = 0
+        self.updates = 0
+        self._next_update = train_every
+
+    def replay_ratio(self):
+        """Replayed samples per collected transition (end-of-episode mode → None)."""
+        if self.train_every == 0:
+            return None
+        return self.gradient_steps * self.batch_size / self.train_every
+
+    def after_step(self, agent, num_steps=1):
+        """Count num_steps new transitions and run any updates now due."""
+        self.env_steps += num_steps
+        if self.train_every == 0:
+            return
+        while self.env_steps >= self._next_update:
+            self._next_update += self.train_every
+            self._update(agent)
+
+    def after_episode(self, agent):
+        if self.train_every == 0:
+            self._update(agent)
+
+    def _update(self, agent):
+        for _ in range(self.gradient_steps):
+            agent.train_long_memory(self.batch_size)
+            self.updates += 1
@@ -0,0 +1,93 @@
+"""
+Exact lookup-table form of a trained DQN.
+
+The state is 11 binary features, so a DQN is fully described by its Q
+values on all 2048 codes. export() runs them through the network in one
+forward pass (rl.numpy_dqn, so no torch); TablePolicy then plays with a
+single array index per step.
+
+    python -m rl.table_policy export models/snake_dqn.pth
+    python -m rl.table_policy diff old.pth models/snake_table.npz
+"""
+
+import argparse
+import os
+import numpy as np
+
+from game.state_bits import NUM_STATES, REACHABLE, pack_states, describe
+from rl.numpy_dqn import NumpyDQN
+
+
+class TablePolicy:
+    """Greedy policy read from a (2048, 3) table of Q values, indexed by state code."""
+
+    def __init__(self, q_values):
+        self.q = np.asarray(q_values, dtype=np.float32)
+        self.actions = self.q.argmax(axis=1).astype(np.uint8)
+
+    def get_action(self, state):
+        return int(self.actions[pack_states(state)])
+
+    def get_actions(self, states):
+        """(N, 11) states or (N,) uint16 codes → (N,) actions."""
+        return self.actions[pack_states(states)].astype(np.int64)
+
+    def save(self, path="models/snake_table.npz"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, q=self.q, actions=self.actions)
+
+    @classmethod
+    def load(cls, path="models/snake_table.npz"):
+        """From a saved table (.npz) or a DQN checkpoint (.pth)."""
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                return cls(data["q"])
+        return export(path)
+
+    def diff(self, other):
+        """Codes whose greedy action differs between the two tables."""
+        return np.flatnonzero(self.actions != other.actions)
+
+
+def export(model_path="models/snake_dqn.pth"):
+    """Evaluate a DQN checkpoint on every state code in one batch → TablePolicy."""
+    return TablePolicy(NumpyDQN.load(model_path).q_table())
+
+
+#Helpers
+
+def _print_diff(a, b, name_a, name_b, show_all):
+    changed = a.diff(b)
+    reachable = changed[REACHABLE[changed]]
+    print(f"  {len(changed)} of {NUM_STATES} states changed action "
+          f"({len(reachable)} of {int(REACHABLE.sum())} reachable)")
+    rows = changed if show_all else reachable
+    if not len(rows):
+        return
+    names = ("straight", "right", "left")
+    print(f"  {'code':>5}  {name_a:>10} -> {name_b:<10}  features")
+    print("-" * 60)
+    for code in rows:
+        print(f"  {code:>5d}  {names[a.actions[code]]:>10} -> {names[b.actions[code]]:<10}  "
+              f"{describe(code)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or compare DQN lookup tables")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="Write the Q/argmax table of a checkpoint")
+    exp.add_argument("model", nargs="?", default="models/snake_dqn.pth")
+    exp.add_argument("-o", "--out", default="models/snake_table.npz")
+    dif = sub.add_parser("diff", help="States whose greedy action differs (.pth or .npz)")
+    dif.add_argument("a")
+    dif.add_argument("b")
+    dif.add_argument("--all", action="store_true", help="Also list unreachable codes")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        policy = export(args.model)
+        policy.save(args.out)
+        print(f"  {NUM_STATES} states -> {args.out} ({os.path.getsize(args.out):,d} bytes)")
+    else:
+        _print_diff(TablePolicy.load(args.a), TablePolicy.load(args.b),
+                    os.path.basename(args.a), os.path.basename(args.b), args.all)
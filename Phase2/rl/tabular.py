@@ -0,0 +1,123 @@
+"""Q-learning over the 2048 packed states, as a NumPy table instead of a network."""
+
+import numpy as np
+
+from game.settings import (
+    RL_GAMMA, RL_TABULAR_LR,
+    RL_EPSILON_START, RL_EPSILON_MIN, RL_EPSILON_DECAY, RL_ACTION_SIZE,
+)
+from game.state_bits import NUM_STATES, pack_states
+from rl.table_policy import TablePolicy
+
+
+class TabularAgent:
+    """
+    Drop-in for DQNAgent in train.py backed by a (2048, 3) Q table.
+
+    States are indexed by their 11-bit code. Every fresh transition is
+    learned from immediately (train_short_memory / train_batch), so there is
+    no replay: remember and train_long_memory do nothing. Saved tables are
+    TablePolicy files, which AI Watch plays directly.
+    """
+
+    def __init__(self, lr=RL_TABULAR_LR):
+        self.device = "numpy"
+        self.q = np.zeros((NUM_STATES, RL_ACTION_SIZE), dtype=np.float32)
+        self.lr = lr
+        self.epsilon = RL_EPSILON_START
+        self.gamma = RL_GAMMA
+        self.n_games = 0
+        self.rng = np.random.default_rng()
+        self._loss_sum = 0.0
+        self._loss_count = 0
+
+    def get_action(self, state):
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(0, RL_ACTION_SIZE))
+        return int(self.q[pack_states(state)].argmax())
+
+    def get_actions(self, states, epsilon=None):
+        """Epsilon-greedy actions for (N, 11) states or (N,) codes → (N,)."""
+        codes = pack_states(states)
+        n = len(codes)
+        eps = self.epsilon if epsilon is None else np.asarray(epsilon)
+        actions = self.q[codes].argmax(axis=1)
+        explore = self.rng.random(n) < eps
+        actions[explore] = self.rng.integers(0, RL_ACTION_SIZE, int(explore.sum()))
+        return actions
+
+
+    def remember(self, state, action, reward, next_state, done):
+        pass
+
+    def remember_batch(self, states, actions, rewards, next_states, dones):
+        pass
+
+
+    def train_short_memory(self, state, action, reward, next_state, done):
+        s, s2 = int(pack_states(state)), int(pack_states(next_state))
+        target = reward if done else reward + self.gamma * self.q[s2].max()
+        self.q[s, action] += self.lr * (target - self.q[s, action])
+
+    def train_batch(self, states, actions, rewards, next_states, dones):
+        """One Q-learning step on N transitions at once."""
+        s = pack_states(states).astype(np.int64)
+        s2 = pack_states(next_states).astype(np.int64)
+        actions = np.asarray(actions, dtype=np.int64)
+        q_next = np.where(dones, 0.0, self.q[s2].max(axis=1))
+        td = np.asarray(rewards, dtype=np.float32) + self.gamma * q_next - self.q[s, actions]
+
+        # boards often share a (state, action) pair within one step; average
+        # their TD errors so a popular pair is not stepped N times over
+        cell = s * RL_ACTION_SIZE + actions
+        size = self.q.size
+        total = np.bincount(cell, weights=td, minlength=size)
+        count = np.bincount(cell, minlength=size)
+        hit = count > 0
+        self.q.reshape(-1)[hit] += self.lr * (total[hit] / count[hit])
+        self._loss_sum += float(np.dot(td, td)) / len(td)
+        self._loss_count += 1
+
+    def train_long_memory(self, batch_size=None):
+        pass
+
+    def start_prefetch(self, batch_size=None, depth=2):
+        pass   # no replay to sample ahead
+
+    def stop_prefetch(self):
+        return None
+
+    def pop_loss(self):
+        """Mean squared TD error of the updates since the last call (None if there were none)."""
+        if not self._loss_count:
+            return None
+        loss = self._loss_sum / self._loss_count
+        self._loss_sum, self._loss_count = 0.0, 0
+        return loss
+
+    #Epsilon Decay
+
+    def decay_epsilon(self):
+        self.epsilon = max(RL_EPSILON_MIN, self.epsilon * RL_EPSILON_DECAY)
+
+
+    def state_dict(self, memory=True):
+        """Snapshot for resuming; there is no replay, so memory is ignored."""
+        import torch   # checkpoints are torch files; playing a table never needs it
+        return {"q": torch.from_numpy(self.q.copy()), "epsilon": self.epsilon,
+                "n_games": self.n_games, "rng": self.rng.bit_generator.state}
+
+    def load_state_dict(self, state):
+        self.q = state["q"].numpy().copy()
+        self.epsilon = state["epsilon"]
+        self.n_games = state["n_games"]
+        self.rng.bit_generator.state = state["rng"]
+
+    def save_async(self, writer, path="models/snake_qtable.npz"):
+        writer.write(path, lambda q, p: TablePolicy(q).save(p), self.q.copy())
+
+    def save(self, path="models/snake_qtable.npz"):
+        TablePolicy(self.q).save(path)
+
+    def load(self, path="models/snake_qtable.npz"):
+        self.q = TablePolicy.load(path).q.copy()
@@ -0,0 +1,293 @@
+"""
+Hyperparameter sweeps: many short DQN training runs, one RunConfig each.
+
+A JSON spec names the search space; any RunConfig field can be swept
+(see rl.config.DEFAULTS):
+
+    {
+      "method": "random",
+      "trials": 16,
+      "episodes": 500,
+      "params": {
+        "lr": {"min": 0.0001, "max": 0.003, "log": true},
+        "gamma": [0.9, 0.95, 0.99],
+        "hidden_1": [128, 256]
+      },
+      "fixed": {"epsilon_decay": 0.99}
+    }
+
+"grid" runs every combination of the listed values; "random" draws
+`trials` configs, each parameter from its list or its min/max range.
+Trials run in a spawn process pool with --threads torch threads per
+process. Every --check-every episodes a trial posts its rolling mean
+score to a table shared by all processes; past --grace episodes it is
+stopped if that mean is below the --quantile of the other trials' means
+at the same episode.
+
+Each trial leaves its metrics log and weights in the output directory,
+results.csv ranks the trials and best.json holds the winner's config.
+
+    python sweep.py sweeps/example.json
+    python sweep.py sweeps/example.json --workers 4 --threads 1 --episodes 300
+    python train.py --envs 64 --config sweeps/example/best.json
+    python evaluate.py sweeps/example            # greedy scores of every trial's model
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+import time
+import numpy as np
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game.settings import (
+    RL_METRICS_WINDOW, RL_SWEEP_CHECK_EVERY, RL_SWEEP_GRACE, RL_SWEEP_QUANTILE, RL_SWEEP_MIN_PEERS,
+)
+from game.vec_env import VecSnakeEnv
+from game.state_bits import unpack_states
+from rl.agent import DQNAgent
+from rl.config import RunConfig, DEFAULTS
+from rl.metrics import MetricsLog, RollingStats
+from train import set_threads
+
+# rolling mean of every trial at every check, shared by the pool's processes
+_progress = None
+
+
+def expand(spec, seed=0):
+    """A spec → the list of per-trial overrides it describes."""
+    method = spec.get("method", "grid")
+    params = spec.get("params", {})
+    fixed = spec.get("fixed", {})
+    unknown = sorted((params.keys() | fixed.keys()) - DEFAULTS.keys())
+    if unknown:
+        raise ValueError(f"unknown hyperparameter(s): {', '.join(unknown)}")
+    if method == "grid":
+        for name, values in params.items():
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"grid search needs a list of values for {name}")
+        names = list(params)
+        return [{**fixed, **dict(zip(names, combo))}
+                for combo in itertools.product(*(params[n] for n in names))]
+    if method == "random":
+        rng = np.random.default_rng(seed)
+        return [{**fixed, **{name: _sample(rng, name, space) for name, space in params.items()}}
+                for _ in range(spec.get("trials", 10))]
+    raise ValueError(f"unknown method {method!r} (grid or random)")
+
+
+def _sample(rng, name, space):
+    if isinstance(space, list) and space:
+        return space[rng.integers(len(space))]
+    if isinstance(space, dict) and "min" in space and "max" in space:
+        lo, hi = space["min"], space["max"]
+        if space.get("log"):
+            return float(math.exp(rng.uniform(math.log(lo), math.log(hi))))
+        return float(rng.uniform(lo, hi))
+    raise ValueError(f"{name}: expected a list of values or {{\"min\", \"max\"[, \"log\"]}}")
+
+
+def _init_worker(progress, shape, threads):
+    global _progress
+    _progress = np.frombuffer(progress, dtype=np.float64).reshape(shape)
+    set_threads(threads)
+
+
+def _post(trial, column, mean, quantile, min_peers):
+    """Record a trial's rolling mean at a check → whether it trails its peers."""
+    _progress[trial, column] = mean
+    peers = np.delete(_progress[:, column], trial)
+    peers = peers[~np.isnan(peers)]
+    return quantile > 0 and len(peers) >= min_peers and mean < np.quantile(peers, quantile)
+
+
+def run_trial(job):
+    """Train one config, stopping early if it falls behind → result row."""
+    trial, values, episodes, num_envs, seed, out_dir, stopping = job
+    start = time.perf_counter()
+    config = RunConfig(**values)
+    env = VecSnakeEnv(num_envs, seed=seed, packed=True, **config.env_kwargs())
+    agent = DQNAgent(packed_memory=True, seed=seed, **config.agent_kwargs())
+    schedule = config.schedule()
+    stats = RollingStats(stopping["window"])
+    metrics = MetricsLog(os.path.join(out_dir, f"trial_{trial:03d}.jsonl"))
+    check_every = stopping["check_every"]
+
+    record, episode, stopped = 0, 0, False
+    states = env.reset()
+    while episode < episodes and not stopped:
+        obs = unpack_states(states)
+        actions = agent.get_actions(obs)
+        next_states, rewards, dones, info = env.step(actions)
+        final_states = info["final_state"]
+        agent.train_batch(obs, actions, rewards, unpack_states(final_states), dones)
+        agent.remember_batch(states, actions, rewards, final_states, dones)
+        schedule.after_step(agent, num_envs)
+        states = next_states
+
+        for i in np.flatnonzero(dones):
+            episode += 1
+            schedule.after_episode(agent)
+            agent.decay_epsilon()
+            agent.n_games += 1
+            score = int(info["score"][i])
+            stats.add(score)
+            record = max(record, score)
+            metrics.log(episode, score, int(info["steps"][i]), agent.epsilon, agent.pop_loss(),
+                        stats.mean, schedule.env_steps)
+            if episode % check_every == 0:
+                behind = _post(trial, episode // check_every - 1, stats.rolling_mean,
+                               stopping["quantile"], stopping["min_peers"])
+                stopped = behind and episode >= stopping["grace"]
+            if stopped or episode == episodes:
+                break
+
+    metrics.close()
+    model_path = os.path.join(out_dir, f"trial_{trial:03d}.pth")
+    agent.model.save(model_path)
+    return {"trial": trial, "status": "stopped" if stopped else "done", "episodes": episode,
+            "rolling_mean": stats.rolling_mean, "mean_score": stats.mean, "record": record,
+            "env_steps": schedule.env_steps, "wall_s": time.perf_counter() - start,
+            "model": model_path, "config": config.to_dict(), "params": values}
+
+
+def sweep(configs, episodes, out_dir, workers=None, threads=None, num_envs=16, seed=0,
+          check_every=RL_SWEEP_CHECK_EVERY, grace=RL_SWEEP_GRACE, quantile=RL_SWEEP_QUANTILE,
+          min_peers=RL_SWEEP_MIN_PEERS, window=RL_METRICS_WINDOW, log=print):
+    """
+    Train every config (a list of RunConfig overrides) → result rows, best
+    first: finished trials by final rolling mean score, then stopped ones.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(configs))
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    os.makedirs(out_dir, exist_ok=True)
+    stopping = {"check_every": check_every, "grace": grace, "quantile": quantile,
+                "min_peers": min_peers, "window": window}
+    jobs = [(t, values, episodes, num_envs, int(np.random.SeedSequence([seed, t]).generate_state(1)[0]),
+             out_dir, stopping) for t, values in enumerate(configs)]
+
+    ctx = mp.get_context("spawn")
+    shape = (len(configs), max(1, episodes // check_every))
+    progress = ctx.RawArray("d", shape[0] * shape[1])
+    np.frombuffer(progress, dtype=np.float64)[:] = np.nan
+    if workers == 1:
+        _init_worker(progress, shape, threads)
+        done = map(run_trial, jobs)
+    else:
+        pool = ctx.Pool(workers, initializer=_init_worker, initargs=(progress, shape, threads))
+        done = pool.imap_unordered(run_trial, jobs)
+    results = []
+    try:
+        for r in done:
+            results.append(r)
+            log(f"  trial {r['trial']:>3d}  {r['status']:<7s} {r['episodes']:>6d} ep  "
+                f"mean {r['rolling_mean']:>6.2f}  record {r['record']:>3d}  {r['wall_s']:>7.1f}s  "
+                f"{_describe(r['params'])}")
+    finally:
+        if workers > 1:
+            if len(results) < len(jobs):
+                pool.terminate()   # interrupted: drop the trials still running
+            else:
+                pool.close()
+            pool.join()
+    return sorted(results, key=lambda r: (r["status"] == "done", r["rolling_mean"]), reverse=True)
+
+
+def write_table(results, path):
+    """Ranked results as CSV: one row per trial, one column per swept parameter."""
+    names = sorted({name for r in results for name in r["params"]})
+    with open(path, "w", newline="") as f:
+        out = csv.writer(f)
+        out.writerow(["rank", "trial", "status", "episodes", "rolling_mean", "mean_score", "record",
+                      "env_steps", "wall_s"] + names)
+        for rank, r in enumerate(results, 1):
+            out.writerow([rank, r["trial"], r["status"], r["episodes"], f"{r['rolling_mean']:.4f}",
+                          f"{r['mean_score']:.4f}", r["record"], r["env_steps"], f"{r['wall_s']:.1f}"]
+                         + [r["params"].get(name, "") for name in names])
+
+
+def _describe(params):
+    return "  ".join(f"{k}={v:g}" if isinstance(v, (int, float)) else f"{k}={v}" for k, v in params.items())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid or random hyperparameter search over DQN training runs")
+    parser.add_argument("spec", help="JSON sweep spec (method, trials, episodes, params, fixed)")
+    parser.add_argument("--method", choices=["grid", "random"], default=None, help="Override the spec's method")
+    parser.add_argument("--trials", type=int, default=None, help="Override the spec's random-search trials")
+    parser.add_argument("--episodes", type=int, default=None, help="Override the spec's episodes per trial")
+    parser.add_argument("--out", default=None, help="Output directory (default: next to the spec, named after it)")
+    parser.add_argument("--workers", type=int, default=None, help="Trials run at once (default: all cores)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="torch threads per worker process (default: cores / workers)")
+    parser.add_argument("--envs", type=int, default=16, help="Boards stepped together in each trial")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random search and of every trial")
+    parser.add_argument("--check-every", type=int, default=RL_SWEEP_CHECK_EVERY,
+                        help="Episodes between early-stopping checks")
+    parser.add_argument("--grace", type=int, default=RL_SWEEP_GRACE,
+                        help="Episodes a trial always plays before it can be stopped")
+    parser.add_argument("--quantile", type=float, default=RL_SWEEP_QUANTILE,
+                        help="Stop trials whose rolling mean is below this quantile of their peers' (0 = never)")
+    parser.add_argument("--min-peers", type=int, default=RL_SWEEP_MIN_PEERS,
+                        help="Other trials needed at a check before any trial is stopped")
+    parser.add_argument("--window", type=int, default=RL_METRICS_WINDOW, help="Episodes in the rolling mean")
+    args = parser.parse_args()
+
+    try:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    except (OSError, ValueError) as e:
+        parser.error(f"{args.spec}: {e}")
+    if args.method:
+        spec["method"] = args.method
+    if args.trials:
+        spec["trials"] = args.trials
+    episodes = args.episodes or spec.get("episodes", 500)
+    if min(episodes, args.envs, args.check_every, args.window) < 1:
+        parser.error("--episodes, --envs, --check-every and --window must be at least 1")
+    if not 0 <= args.quantile <= 1:
+        parser.error("--quantile must be between 0 and 1")
+    try:
+        configs = expand(spec, args.seed)
+    except ValueError as e:
+        parser.error(f"{args.spec}: {e}")
+    if not configs:
+        parser.error(f"{args.spec}: no trials")
+    try:
+        for values in configs:
+            RunConfig(**values).schedule()
+    except ValueError as e:
+        parser.error(f"{args.spec}: {e}")
+    out_dir = args.out or os.path.splitext(args.spec)[0]
+
+    workers = min(args.workers or os.cpu_count() or 1, len(configs))
+    threads = args.threads or max(1, (os.cpu_count() or 1) // workers)
+    print(f"  {len(configs)} trial(s) ({spec.get('method', 'grid')}) x {episodes:,d} episodes on "
+          f"{args.envs} boards, {workers} worker(s) x {threads} thread(s)")
+    print(f"  Early stopping: below the {args.quantile:g} quantile of >= {args.min_peers} peers' "
+          f"last-{args.window} mean, checked every {args.check_every} episodes after {args.grace}")
+    print("-" * 100)
+    start = time.perf_counter()
+    results = sweep(configs, episodes, out_dir, workers, threads, args.envs, args.seed, args.check_every,
+                    args.grace, args.quantile, args.min_peers, args.window)
+    elapsed = time.perf_counter() - start
+
+    table = os.path.join(out_dir, "results.csv")
+    write_table(results, table)
+    best = results[0]
+    RunConfig(**best["params"]).save(os.path.join(out_dir, "best.json"))
+    stopped = sum(r["status"] == "stopped" for r in results)
+    print("-" * 100)
+    print(f"  {len(results)} trials in {elapsed:.1f}s, {stopped} stopped early")
+    print(f"  {'#':>2s} {'trial':>5s} {'status':<7s} {'episodes':>8s} {'mean':>6s} {'record':>6s}  params")
+    for rank, r in enumerate(results, 1):
+        print(f"  {rank:>2d} {r['trial']:>5d} {r['status']:<7s} {r['episodes']:>8d} {r['rolling_mean']:>6.2f} "
+              f"{r['record']:>6d}  {_describe(r['params'])}")
+    print(f"  -> {table}")
+    print(f"  -> {os.path.join(out_dir, 'best.json')} (python train.py --config ...)")
@@ -3,30 +3,54 @@
 import argparse
 import sys
 import os
+import time
+import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from game.snake_env import SnakeEnv
+from game.settings import (
+    RL_BATCH_SIZE, RL_APEX_SYNC_EVERY, RL_CHECKPOINT_EVERY, RL_CHECKPOINT_KEEP,
+    RL_COMPILE, RL_BF16, RL_THREADS, RL_INTEROP_THREADS, RL_HIDDEN_1, RL_HIDDEN_2,
+)
 from rl.agent import DQNAgent
-from rl.utils import plot_training
+from rl.config import RunConfig, SCHEDULE_KEYS
+from rl.dashboard import start_viewer
+from rl.metrics import MetricsLog, RollingStats
+from rl.checkpoint import CheckpointWriter
+from rl.profiler import PhaseProfiler, CaptureWindow
 
 
-def train(episodes=500, render=False, plot=True):
-    env = SnakeEnv()
-    agent = DQNAgent()
+def train(episodes=500, render=False, plot=True, packed=False, prioritized=False, schedule=None,
+          algo="dqn", checkpoint_every=RL_CHECKPOINT_EVERY, keep=RL_CHECKPOINT_KEEP, prefetch=False,
+          compile_model=False, bf16=False, profile=False, profile_out=None, capture=None, config=None):
+    """
+    profile times each phase of the loop and prints the breakdown at the
+    end (and writes it to profile_out as JSON); capture is an optional
+    CaptureWindow for a cProfile of one episode. config is a RunConfig of
+    hyperparameters (the settings defaults if None).
+    """
+    config = config or RunConfig()
+    env = SnakeEnv(**config.env_kwargs())
+    agent, model_path, prefix = _make_agent(algo, packed, prioritized, compile_model, bf16, config)
+    schedule = schedule or config.schedule()
+    profiler = PhaseProfiler(enabled=profile, keep_episodes=profile_out is not None)
+    profiler.wrap(agent, "get_action", "train_short_memory", "remember", "train_long_memory")
+    profiler.wrap(env, "step", prefix="env.")
 
-    scores = []
-    mean_scores = []
-    total_score = 0
-    record = 0
-    model_path = "models/snake_dqn.pth"
-
-    if os.path.exists(model_path):
-        agent.load(model_path)
-        print(f"  Resumed from {model_path}")
+    writer = CheckpointWriter(prefix=prefix, keep=keep)
+    stats, record = _resume(agent, model_path, writer)
+    metrics = MetricsLog(start_episode=stats.count)
+    if plot:
+        start_viewer(metrics.path)
 
     print(f"  Training for {episodes} episodes...")
-    print(f"  Device: {agent.device}")
+    _print_device(agent)
+    _print_schedule(schedule)
+    _print_config(config)
+    if prefetch:
+        agent.start_prefetch(schedule.batch_size)
+        print("  Replay prefetch: on")
     print("-" * 50)
 
     renderer = None
@@ -35,14 +59,18 @@ def train(episodes=500, render=False, plot=True):
         renderer = Renderer()
 
     for episode in range(1, episodes + 1):
+        if capture:
+            capture.begin(episode)
         state = env.reset()
         done = False
 
         while not done:
             action = agent.get_action(state)
             next_state, reward, done, info = env.step(action)
-            agent.train_short_memory(state, action, reward, next_state, done)
+            if schedule.short_memory:
+                agent.train_short_memory(state, action, reward, next_state, done)
             agent.remember(state, action, reward, next_state, done)
+            schedule.after_step(agent)
 
             state = next_state
 
@@ -51,62 +79,501 @@ def train(episodes=500, render=False, plot=True):
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         renderer.quit()
+                        writer.close()
+                        metrics.close()
+                        agent.stop_prefetch()
+                        if profile:
+                            _print_profile(profiler, profile_out)
                         return
 
-                renderer.draw_background()
-                renderer.draw_obstacles(env.get_obstacle_pixels())
-                renderer.draw_food(env.get_food_pixel())
-                renderer.draw_snake(env.get_snake_pixels(), env.direction)
-                renderer.draw_hud(env.score, env.level, record)
+                with profiler.phase("render"):
+                    renderer.draw_background()
+                    renderer.draw_obstacles(env.get_obstacle_pixels())
+                    if env.food is not None:
+                        renderer.draw_food(env.get_food_pixel())
+                    renderer.draw_snake(env.get_snake_pixels(), env.direction)
+                    renderer.draw_hud(env.score, env.level, record)
 
-                label = renderer.font_tiny.render(
-                    f"Episode {episode}/{episodes}  |  ε={agent.epsilon:.3f}", True, (150, 150, 180))
-                renderer.screen.blit(label, (10, 580))
+                    label = renderer.font_tiny.render(
+                        f"Episode {episode}/{episodes}  |  ε={agent.epsilon:.3f}", True, (150, 150, 180))
+                    renderer.screen.blit(label, (10, 580))
 
-                renderer.update()
-                renderer.flip()
-                renderer.tick_clock(60)
+                    renderer.update()
+                    renderer.flip()
+                    renderer.tick_clock(60)
 
-        # batch replay at end of episode
-        agent.train_long_memory()
+        # batch replay at end of episode (unless learning on a fixed cadence)
+        schedule.after_episode(agent)
         agent.decay_epsilon()
         agent.n_games += 1
 
         score = info["score"]
-        total_score += score
-        mean_score = total_score / episode
-        scores.append(score)
-        mean_scores.append(mean_score)
+        stats.add(score)
+        mean_score = stats.mean
 
         if score > record:
             record = score
-            agent.save(model_path)
+            agent.save_async(writer, model_path)
+
+        if checkpoint_every and episode % checkpoint_every == 0:
+            _checkpoint(agent, writer, stats, record)
 
         if episode % 10 == 0 or episode == 1:
             print(f"  Ep {episode:>4d}  |  Score: {score:>3d}  |  "
                   f"Record: {record:>3d}  |  Mean: {mean_score:>6.1f}  |  "
                   f"ε: {agent.epsilon:.3f}")
 
-        if plot and episode % 10 == 0:
-            try:
-                plot_training(scores, mean_scores)
-            except Exception:
-                pass
+        with profiler.phase("metrics"):
+            metrics.log(stats.count, score, env.frame_iteration, agent.epsilon, agent.pop_loss(),
+                        mean_score, schedule.env_steps)
 
-    agent.save(model_path)
+        profiler.end_episode()
+        if capture:
+            capture.end(episode)
+
+    agent.save_async(writer, model_path)
+    _checkpoint(agent, writer, stats, record)
+    writer.close()
+    metrics.close()
+    _print_prefetch(agent.stop_prefetch())
     print("-" * 50)
     print(f"  Training complete! Record score: {record}")
     print(f"  Model saved to {model_path}")
+    if profile:
+        _print_profile(profiler, profile_out)
 
     if renderer:
         renderer.quit()
 
 
+def _make_agent(algo, packed=False, prioritized=False, compile_model=False, bf16=False, config=None):
+    """algo → (agent, path it is saved to, checkpoint prefix)."""
+    if algo == "tabular":
+        from rl.tabular import TabularAgent
+        return TabularAgent(), "models/snake_qtable.npz", "tabular"
+    config = config or RunConfig()
+    agent = DQNAgent(packed_memory=packed, prioritized=prioritized, compile_model=compile_model, bf16=bf16,
+                     **config.agent_kwargs())
+    # a network of another size gets its own files, so it never replaces the default one
+    shape = (config.hidden_1, config.hidden_2)
+    suffix = "" if shape == (RL_HIDDEN_1, RL_HIDDEN_2) else f"_{shape[0]}x{shape[1]}"
+    return agent, f"models/snake_dqn{suffix}.pth", f"dqn{suffix}"
+
+
+def set_threads(threads=0, interop_threads=0):
+    """Pin torch's thread pools for this process (0 leaves torch's default)."""
+    import torch
+    if threads:
+        torch.set_num_threads(threads)
+    if interop_threads:
+        # only settable before any inter-op work has started
+        torch.set_num_interop_threads(interop_threads)
+
+
+def _resume(agent, model_path, writer):
+    """
+    Restore the newest full checkpoint, else just the saved weights
+    → (score RollingStats, record) to continue from.
+    """
+    stats = RollingStats()
+    state = writer.load_latest()
+    if state is not None and not _fits(agent, lambda: state["model"]):
+        _refuse(writer.paths()[-1])
+    if state is not None:
+        agent.load_state_dict(state)
+        print(f"  Resumed from {writer.paths()[-1]} (game {agent.n_games}, ε={agent.epsilon:.3f})")
+        h = state["history"]
+        if "stats" in h:
+            stats.load_state_dict(h["stats"])
+        else:
+            # checkpoints from before the metrics log kept every score
+            for score in h["scores"]:
+                stats.add(score)
+        return stats, h["record"]
+    if os.path.exists(model_path):
+        if not _fits(agent, lambda: _weights(model_path)):
+            _refuse(model_path)
+        agent.load(model_path)
+        print(f"  Resumed from {model_path}")
+    return stats, 0
+
+
+def _refuse(path):
+    # training on would overwrite it and prune its checkpoints
+    raise SystemExit(f"  {path} holds a network of another shape than this run's; "
+                     f"move it and its checkpoints aside to start fresh")
+
+
+def _fits(agent, weights):
+    """Whether saved weights (a callable, loaded only for a network) match the agent's layer shapes."""
+    model = getattr(agent, "model", None)
+    if model is None:
+        return True   # a Q table always has the same shape
+    ours = {k: tuple(v.shape) for k, v in model.state_dict().items()}
+    return ours == {k: tuple(v.shape) for k, v in weights().items()}
+
+
+def _weights(path):
+    import torch
+    return torch.load(path, map_location="cpu", weights_only=True)
+
+
+def _checkpoint(agent, writer, stats, record):
+    """Snapshot the full training state and hand it to the background writer."""
+    state = agent.state_dict()
+    state["history"] = {"stats": stats.state_dict(), "record": record}
+    writer.checkpoint(state, agent.n_games)
+
+
+def _print_profile(profiler, profile_out):
+    print("-" * 50)
+    profiler.print_summary()
+    if profile_out:
+        profiler.dump(profile_out)
+        print(f"  Profile -> {profile_out}")
+
+
+def _print_prefetch(stats):
+    if stats and stats["batches"]:
+        n = stats["batches"]
+        print(f"  Replay prefetch: waited {stats['wait_s'] * 1e6 / n:.0f} us vs "
+              f"{stats['compute_s'] * 1e6 / n:.0f} us computing per batch "
+              f"({stats['wait_share']:.1%} of learner time waiting)")
+
+
+def _print_device(agent):
+    import torch
+    flags = []
+    if getattr(agent, "train_model", None) is not getattr(agent, "model", None):
+        flags.append("compiled")
+    if getattr(agent, "bf16", False):
+        flags.append("bf16 autocast")
+    if agent.device != "numpy":
+        flags.append(f"{torch.get_num_threads()} threads, {torch.get_num_interop_threads()} interop")
+    print(f"  Device: {agent.device}" + (f" ({', '.join(flags)})" if flags else ""))
+
+
+def _print_schedule(schedule):
+    if schedule.train_every == 0:
+        print(f"  Updates: end of episode, batch {schedule.batch_size}")
+    else:
+        print(f"  Updates: {schedule.gradient_steps} x batch {schedule.batch_size} "
+              f"every {schedule.train_every} steps (replay ratio {schedule.replay_ratio():.2f})")
+    if not schedule.short_memory:
+        print("  Per-step updates: off")
+
+
+def _print_config(config):
+    changed = {k: v for k, v in config.changed().items() if k not in SCHEDULE_KEYS}
+    if changed:
+        print(f"  Hyperparameters: {', '.join(f'{k}={v:g}' for k, v in changed.items())}")
+
+
+def train_vec(episodes=500, num_envs=64, workers=1, plot=True, packed=False, prioritized=False,
+              schedule=None, algo="dqn", checkpoint_every=RL_CHECKPOINT_EVERY, keep=RL_CHECKPOINT_KEEP,
+              prefetch=False, compile_model=False, bf16=False, config=None):
+    """Same training recipe as train(), driving num_envs boards per step."""
+    from game.vec_env import VecSnakeEnv
+    from game.subproc_env import SubprocSnakeEnv
+    from game.state_bits import unpack_states
+
+    # packed: boards hand back uint16 state codes, expanded only for the model
+    config = config or RunConfig()
+    if workers > 1:
+        env = SubprocSnakeEnv(num_envs, workers, packed=packed, **config.env_kwargs())
+    else:
+        env = VecSnakeEnv(num_envs, packed=packed, **config.env_kwargs())
+    agent, model_path, prefix = _make_agent(algo, packed, prioritized, compile_model, bf16, config)
+    schedule = schedule or config.schedule()
+
+    writer = CheckpointWriter(prefix=prefix, keep=keep)
+    stats, record = _resume(agent, model_path, writer)
+    metrics = MetricsLog(start_episode=stats.count)
+    if plot:
+        start_viewer(metrics.path)
+
+    print(f"  Training for {episodes} episodes on {num_envs} boards ({workers} worker(s))...")
+    _print_device(agent)
+    _print_schedule(schedule)
+    _print_config(config)
+    if prefetch:
+        agent.start_prefetch(schedule.batch_size)
+        print("  Replay prefetch: on")
+    print("-" * 50)
+
+    states = env.reset()
+    episode = 0
+    while episode < episodes:
+        obs = unpack_states(states) if packed else states
+        actions = agent.get_actions(obs)
+        next_states, rewards, dones, info = env.step(actions)
+        final_states = info["final_state"]
+        final_obs = unpack_states(final_states) if packed else final_states
+
+        if schedule.short_memory:
+            agent.train_batch(obs, actions, rewards, final_obs, dones)
+        agent.remember_batch(states, actions, rewards, final_states, dones)
+        schedule.after_step(agent, num_envs)
+        states = next_states
+
+        for i in np.flatnonzero(dones):
+            if episode == episodes:
+                break
+            episode += 1
+            schedule.after_episode(agent)
+            agent.decay_epsilon()
+            agent.n_games += 1
+
+            score = int(info["score"][i])
+            stats.add(score)
+            mean_score = stats.mean
+
+            if score > record:
+                record = score
+                agent.save_async(writer, model_path)
+
+            if checkpoint_every and episode % checkpoint_every == 0:
+                _checkpoint(agent, writer, stats, record)
+
+            if episode % 10 == 0 or episode == 1:
+                print(f"  Ep {episode:>4d}  |  Score: {score:>3d}  |  "
+                      f"Record: {record:>3d}  |  Mean: {mean_score:>6.1f}  |  "
+                      f"ε: {agent.epsilon:.3f}")
+
+            metrics.log(stats.count, score, int(info["steps"][i]), agent.epsilon, agent.pop_loss(),
+                        mean_score, schedule.env_steps)
+
+    if workers > 1:
+        env.close()
+    agent.save_async(writer, model_path)
+    _checkpoint(agent, writer, stats, record)
+    writer.close()
+    metrics.close()
+    _print_prefetch(agent.stop_prefetch())
+    print("-" * 50)
+    print(f"  Training complete! Record score: {record}")
+    print(f"  Model saved to {model_path}")
+
+
+def train_apex(episodes=500, actors=None, envs_per_actor=8, plot=True, prioritized=False,
+               batch_size=RL_BATCH_SIZE, sync_every=RL_APEX_SYNC_EVERY,
+               checkpoint_every=RL_CHECKPOINT_EVERY, keep=RL_CHECKPOINT_KEEP, prefetch=False,
+               compile_model=False, bf16=False):
+    """
+    Ape-X style: actor processes play with per-board epsilons while this
+    process only learns, broadcasting weights every sync_every updates.
+    """
+    from rl.apex import ActorPool
+
+    agent = DQNAgent(packed_memory=True, prioritized=prioritized, compile_model=compile_model, bf16=bf16)
+
+    model_path = "models/snake_dqn.pth"
+    writer = CheckpointWriter(prefix="dqn", keep=keep)
+    stats, record = _resume(agent, model_path, writer)
+    metrics = MetricsLog(start_episode=stats.count)
+    if plot:
+        start_viewer(metrics.path)
+
+    pool = ActorPool(agent.model, actors, envs_per_actor)
+    print(f"  Training for {episodes} episodes with {pool.num_actors} actor(s) "
+          f"x {envs_per_actor} boards...")
+    _print_device(agent)
+    print(f"  Updates: continuous, batch {batch_size}, weights broadcast every {sync_every}")
+    if prefetch:
+        agent.start_prefetch(batch_size)
+        print("  Replay prefetch: on")
+    print("-" * 50)
+
+    updates = 0
+    episode = 0
+    start = time.perf_counter()
+    try:
+        while episode < episodes:
+            # only wait for actors while there is nothing to learn from yet
+            learning = len(agent.memory) >= batch_size
+            for batch, finished in pool.poll(timeout=None if learning else 0.5):
+                agent.remember_batch(batch["states"], batch["actions"], batch["rewards"],
+                                     batch["next_states"], batch["dones"])
+                for score in finished:
+                    if episode == episodes:
+                        break
+                    episode += 1
+                    agent.n_games += 1
+
+                    stats.add(score)
+                    mean_score = stats.mean
+
+                    if score > record:
+                        record = score
+                        agent.save_async(writer, model_path)
+
+                    if checkpoint_every and episode % checkpoint_every == 0:
+                        _checkpoint(agent, writer, stats, record)
+
+                    if episode % 10 == 0 or episode == 1:
+                        elapsed = time.perf_counter() - start
+                        print(f"  Ep {episode:>4d}  |  Score: {score:>3d}  |  "
+                              f"Record: {record:>3d}  |  Mean: {mean_score:>6.1f}  |  "
+                              f"{pool.env_steps / elapsed:>7,.0f} steps/s  |  "
+                              f"{updates / elapsed:>5,.0f} updates/s")
+
+                    metrics.log(stats.count, score, loss=agent.pop_loss(), mean_score=mean_score,
+                                env_steps=pool.env_steps)
+
+            if learning:
+                agent.train_long_memory(batch_size)
+                updates += 1
+                if updates % sync_every == 0:
+                    pool.publish(agent.model)
+    finally:
+        pool.close()
+
+    elapsed = time.perf_counter() - start
+    agent.save_async(writer, model_path)
+    _checkpoint(agent, writer, stats, record)
+    writer.close()
+    metrics.close()
+    _print_prefetch(agent.stop_prefetch())
+    print("-" * 50)
+    print(f"  Training complete! Record score: {record}")
+    print(f"  {pool.env_steps:,d} env steps, {updates:,d} updates in {elapsed:.1f}s")
+    print(f"  Model saved to {model_path}")
+
+
+def train_offline(dataset_dir, epochs=1, batch_size=RL_BATCH_SIZE, algo="dqn", seed=None,
+                  compile_model=False, bf16=False):
+    """Learn from a fixed dataset written by rl.dataset, streamed from disk."""
+    from rl.dataset import TransitionDataset
+
+    data = TransitionDataset(dataset_dir)
+    agent, model_path, _ = _make_agent(algo, compile_model=compile_model, bf16=bf16)
+    if os.path.exists(model_path):
+        agent.load(model_path)
+        print(f"  Resumed from {model_path}")
+
+    total = epochs * data.num_batches(batch_size)
+    print(f"  Training on {len(data):,d} transitions from {dataset_dir}, {epochs} epoch(s)...")
+    _print_device(agent)
+    print(f"  Updates: {total:,d} x batch {batch_size}")
+    print("-" * 50)
+
+    start = time.perf_counter()
+    updates = 0
+    for batch in data.batches(batch_size, epochs, seed):
+        agent.train_batch(*batch)
+        updates += 1
+        if updates % 1000 == 0 or updates == total:
+            elapsed = time.perf_counter() - start
+            print(f"  Update {updates:>8,d}/{total:,d}  |  {updates / elapsed:>6,.0f} updates/s  |  "
+                  f"{updates * batch_size / elapsed:>9,.0f} samples/s")
+
+    agent.save(model_path)
+    print("-" * 50)
+    print(f"  Offline training complete! {updates:,d} updates in {time.perf_counter() - start:.1f}s")
+    print(f"  Model saved to {model_path}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Train Snake RL Agent")
     parser.add_argument("--episodes", type=int, default=500, help="Number of training episodes")
     parser.add_argument("--render", action="store_true", help="Show game during training")
     parser.add_argument("--no-plot", action="store_true", help="Disable live plotting")
+    parser.add_argument("--envs", type=int, default=1, help="Boards stepped together (>1 uses VecSnakeEnv)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes sharing the boards (SubprocSnakeEnv)")
+    parser.add_argument("--packed", action="store_true", help="Keep states as 11-bit codes in replay and between processes")
+    parser.add_argument("--prioritized", action="store_true", help="Prioritized experience replay (sum-tree)")
+    parser.add_argument("--train-every", type=int, default=0,
+                        help="Replay update every K env steps (0 = once per episode)")
+    parser.add_argument("--gradient-steps", type=int, default=1, help="Replay batches per update")
+    parser.add_argument("--batch-size", type=int, default=RL_BATCH_SIZE, help="Replay batch size")
+    parser.add_argument("--no-short-memory", action="store_true", help="Skip the batch-of-one update after each step")
+    parser.add_argument("--algo", choices=["dqn", "tabular"], default="dqn",
+                        help="Learner: DQN network or a Q table over the 2048 states")
+    parser.add_argument("--compile", action="store_true", default=RL_COMPILE,
+                        help="torch.compile the model for training updates")
+    parser.add_argument("--bf16", action="store_true", default=RL_BF16,
+                        help="bf16 autocast for the training forward passes")
+    parser.add_argument("--threads", type=int, default=RL_THREADS,
+                        help="torch intra-op threads for this process (0 = torch default)")
+    parser.add_argument("--interop-threads", type=int, default=RL_INTEROP_THREADS,
+                        help="torch inter-op threads for this process (0 = torch default)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each phase of the single-board loop and print a breakdown")
+    parser.add_argument("--profile-out", default=None,
+                        help="With --profile, also write the breakdown and per-episode totals as JSON")
+    parser.add_argument("--profile-episode", type=int, default=None,
+                        help="cProfile this episode into --profile-file")
+    parser.add_argument("--profile-file", default="profile.prof",
+                        help="Output of --profile-episode (pstats format)")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Sample replay batches ahead on a background thread")
+    parser.add_argument("--checkpoint-every", type=int, default=RL_CHECKPOINT_EVERY,
+                        help="Episodes between full training-state checkpoints (0 = only at the end)")
+    parser.add_argument("--keep-checkpoints", type=int, default=RL_CHECKPOINT_KEEP,
+                        help="Newest checkpoints kept on disk")
+    parser.add_argument("--dataset", default=None, help="Train offline from a dataset written by rl.dataset")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over --dataset")
+    parser.add_argument("--actors", type=int, default=0,
+                        help="Actor processes feeding a dedicated learner (Ape-X style, 0 = off)")
+    parser.add_argument("--sync-every", type=int, default=RL_APEX_SYNC_EVERY,
+                        help="Learner updates between weight broadcasts to actors")
+    parser.add_argument("--config", default=None,
+                        help="JSON of hyperparameters (see rl.config, e.g. a sweep's best.json); "
+                             "--train-every, --gradient-steps and --batch-size still override it")
+    # the config file supplies the defaults of the schedule flags, so explicit flags win
+    config = RunConfig()
+    known, _ = parser.parse_known_args()
+    if known.config:
+        try:
+            config = RunConfig.load(known.config)
+        except (OSError, ValueError) as e:
+            parser.error(f"--config: {e}")
+        parser.set_defaults(train_every=config.train_every, gradient_steps=config.gradient_steps,
+                            batch_size=config.batch_size)
     args = parser.parse_args()
+    if args.algo == "tabular" and args.actors:
+        parser.error("--actors trains a DQN; it cannot be combined with --algo tabular")
+    if args.algo == "tabular" and args.prefetch:
+        parser.error("--algo tabular has no replay to prefetch")
+    if args.algo == "tabular" and (args.compile or args.bf16):
+        parser.error("--compile and --bf16 apply to the DQN only")
+    if (args.profile or args.profile_episode) and (args.dataset or args.actors or args.envs > 1
+                                                   or args.workers > 1):
+        parser.error("--profile and --profile-episode apply to the single-board loop")
+    if args.keep_checkpoints < 1:
+        parser.error("--keep-checkpoints must be at least 1")
+    if args.train_every < 0:
+        parser.error("--train-every must be 0 (once per episode) or more")
+    if args.gradient_steps < 1 or args.batch_size < 1:
+        parser.error("--gradient-steps and --batch-size must be at least 1")
+    if args.algo == "tabular" and args.no_short_memory:
+        parser.error("--algo tabular learns only from fresh transitions; drop --no-short-memory")
+    if args.config and (args.algo == "tabular" or args.actors or args.dataset):
+        parser.error("--config applies to DQN training on SnakeEnv or VecSnakeEnv boards")
 
-    train(episodes=args.episodes, render=args.render, plot=not args.no_plot)
+    set_threads(args.threads, args.interop_threads)
+    accel = {"compile_model": args.compile, "bf16": args.bf16}
+    config.train_every, config.gradient_steps, config.batch_size = (
+        args.train_every, args.gradient_steps, args.batch_size)
+    schedule = config.schedule(short_memory=not args.no_short_memory)
+    if args.dataset:
+        train_offline(args.dataset, epochs=args.epochs, batch_size=args.batch_size, algo=args.algo, **accel)
+    elif args.actors:
+        train_apex(episodes=args.episodes, actors=args.actors, envs_per_actor=args.envs,
+                   plot=not args.no_plot, prioritized=args.prioritized,
+                   batch_size=args.batch_size, sync_every=args.sync_every,
+                   checkpoint_every=args.checkpoint_every, keep=args.keep_checkpoints,
+                   prefetch=args.prefetch, **accel)
+    elif args.envs > 1 or args.workers > 1:
+        train_vec(episodes=args.episodes, num_envs=max(args.envs, args.workers),
+                  workers=args.workers, plot=not args.no_plot, packed=args.packed,
+                  prioritized=args.prioritized, schedule=schedule, algo=args.algo,
+                  checkpoint_every=args.checkpoint_every, keep=args.keep_checkpoints,
+                  prefetch=args.prefetch, config=config, **accel)
+    else:
+        train(episodes=args.episodes, render=args.render, plot=not args.no_plot,
+              packed=args.packed, prioritized=args.prioritized, schedule=schedule, algo=args.algo,
+              checkpoint_every=args.checkpoint_every, keep=args.keep_checkpoints,
+              prefetch=args.prefetch, profile=args.profile, profile_out=args.profile_out,
+              capture=CaptureWindow(args.profile_episode, args.profile_file) if args.profile_episode else None,
+              config=config, **accel)